@@ -0,0 +1,244 @@
+"""Measures the startup of the Android SOAP client: building both zeep clients \
+    eagerly without a cache, as the client used to, against constructing \
+    the lazy client and building its service clients from a cold \
+    and from a warm WSDL cache. The WSDLs are generated from the types \
+    in zonerama_api/android/api_types.py and served locally with a latency.
+
+Run with `python -m benchmarks.android_startup [--latency MS] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import statistics
+import tempfile
+import threading
+import time
+import types
+import typing
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator
+
+import zeep
+from zeep.cache import SqliteCache
+
+from zonerama_api.android import android_api, api_types
+
+NAMESPACE = "http://zonerama.com/services/android/"
+XSD_TYPES: dict[Any, str] = {
+    bool: "s:boolean",
+    int: "s:int",
+    float: "s:double",
+    str: "s:string",
+    datetime: "s:dateTime",
+    Any: "s:anyType",
+}
+
+
+def _field_element(name: str, hint: Any) -> str:
+    optional = type(None) in typing.get_args(hint)
+    if isinstance(hint, types.UnionType):
+        hint = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+
+    occurs = f'minOccurs="{0 if optional else 1}" maxOccurs="1"'
+    if typing.get_origin(hint) is list:
+        (hint,) = typing.get_args(hint)
+        occurs = 'minOccurs="0" maxOccurs="unbounded"'
+
+    xsd_type = XSD_TYPES.get(hint)
+    if xsd_type is None:
+        xsd_type = f"tns:{hint.__name__}"
+    return f'<s:element {occurs} name="{name}" type="{xsd_type}" />'
+
+
+def generate_wsdl(service: str, operations: list[str]) -> bytes:
+    """An ASMX style WSDL declaring all the types of api_types \
+        and the given operations, each taking the type of its name \
+        and returning the type of its name suffixed with Response.
+    """
+    classes = [
+        cls
+        for cls in vars(api_types).values()
+        if isinstance(cls, type) and dataclasses.is_dataclass(cls)
+    ]
+    hints = {cls: typing.get_type_hints(cls) for cls in classes}
+
+    schema = []
+    for cls in classes:
+        fields = "".join(
+            _field_element(field.name, hints[cls][field.name])
+            for field in dataclasses.fields(cls)
+        )
+        schema.append(
+            f'<s:complexType name="{cls.__name__}">'
+            f"<s:sequence>{fields}</s:sequence></s:complexType>"
+        )
+    for operation in operations:
+        for name in (operation, f"{operation}Response"):
+            schema.append(f'<s:element name="{name}" type="tns:{name}" />')
+
+    messages, port_type, binding = [], [], []
+    for operation in operations:
+        for suffix, element in (
+            ("SoapIn", operation),
+            ("SoapOut", f"{operation}Response"),
+        ):
+            messages.append(
+                f'<wsdl:message name="{operation}{suffix}">'
+                f'<wsdl:part name="parameters" element="tns:{element}" /></wsdl:message>'
+            )
+        port_type.append(
+            f'<wsdl:operation name="{operation}">'
+            f'<wsdl:input message="tns:{operation}SoapIn" />'
+            f'<wsdl:output message="tns:{operation}SoapOut" /></wsdl:operation>'
+        )
+        binding.append(
+            f'<wsdl:operation name="{operation}">'
+            f'<soap:operation soapAction="{NAMESPACE}{operation}" style="document" />'
+            '<wsdl:input><soap:body use="literal" /></wsdl:input>'
+            '<wsdl:output><soap:body use="literal" /></wsdl:output></wsdl:operation>'
+        )
+
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<wsdl:definitions xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" '
+        'xmlns:s="http://www.w3.org/2001/XMLSchema" '
+        'xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" '
+        f'xmlns:tns="{NAMESPACE}" targetNamespace="{NAMESPACE}">'
+        "<wsdl:types>"
+        f'<s:schema elementFormDefault="qualified" targetNamespace="{NAMESPACE}">'
+        f'{"".join(schema)}</s:schema></wsdl:types>'
+        f'{"".join(messages)}'
+        f'<wsdl:portType name="{service}Soap">{"".join(port_type)}</wsdl:portType>'
+        f'<wsdl:binding name="{service}Soap" type="tns:{service}Soap">'
+        '<soap:binding transport="http://schemas.xmlsoap.org/soap/http" />'
+        f'{"".join(binding)}</wsdl:binding>'
+        f'<wsdl:service name="{service}"><wsdl:port name="{service}Soap" '
+        f'binding="tns:{service}Soap"><soap:address location="{NAMESPACE}" />'
+        "</wsdl:port></wsdl:service></wsdl:definitions>"
+    ).encode()
+
+
+class WsdlServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    latency: float
+    documents: dict[str, bytes]  # by path
+    requests: int
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), WsdlHandler)
+        self.latency = latency
+        operations = sorted(
+            name for name in vars(api_types) if hasattr(api_types, f"{name}Response")
+        )
+        self.documents = {
+            "/apiservice.asmx": generate_wsdl("ApiService", operations[::2]),
+            "/dataservice.asmx": generate_wsdl("DataService", operations[1::2]),
+        }
+        self.requests = 0
+
+
+class WsdlHandler(BaseHTTPRequestHandler):
+    server: WsdlServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)
+        self.server.requests += 1
+        body = self.server.documents.get(self.path.split("?")[0])
+        if body is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@contextmanager
+def serve(latency: float) -> Iterator[WsdlServer]:
+    """Serves the WSDLs and points the client at them for the block."""
+    server = WsdlServer(latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    originals = android_api.WSDL_API, android_api.WSDL_DATA
+    android_api.WSDL_API = f"{base_url}/apiservice.asmx?WSDL"
+    android_api.WSDL_DATA = f"{base_url}/dataservice.asmx?WSDL"
+    try:
+        yield server
+    finally:
+        android_api.WSDL_API, android_api.WSDL_DATA = originals
+        server.shutdown()
+        server.server_close()
+
+
+def eager_startup(cache_path: str) -> None:
+    # What Client.__init__ did before building the clients lazily
+    transport = zeep.Transport()
+    zeep.Client(wsdl=android_api.WSDL_API, transport=transport)
+    zeep.Client(wsdl=android_api.WSDL_DATA, transport=transport)
+
+
+def lazy_construction(cache_path: str) -> None:
+    android_api.Client("user@example.com", "password", SqliteCache(cache_path))
+
+
+def lazy_first_use(cache_path: str) -> None:
+    client = android_api.Client("user@example.com", "password", SqliteCache(cache_path))
+    client._client_api
+    client._client_data
+
+
+def measure(
+    case: Callable[[str], None], server: WsdlServer, repeat: int, warm: bool
+) -> tuple[float, float]:
+    """Returns the median seconds and requests of case, \
+        run each time with a fresh cache or one filled beforehand.
+    """
+    times, requests = [], []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as folder:
+            cache_path = os.path.join(folder, "cache.db")
+            if warm:
+                lazy_first_use(cache_path)
+
+            server.requests = 0
+            began = time.perf_counter()
+            case(cache_path)
+            times.append(time.perf_counter() - began)
+            requests.append(server.requests)
+
+    return statistics.median(times), statistics.median(requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--latency", type=float, default=100, help="latency per request in ms"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with serve(args.latency / 1000) as server:
+        for name, case, warm in (
+            ("eager, no cache", eager_startup, False),
+            ("lazy, construction", lazy_construction, False),
+            ("lazy, first use, cold cache", lazy_first_use, False),
+            ("lazy, first use, warm cache", lazy_first_use, True),
+        ):
+            seconds, requests = measure(case, server, args.repeat, warm)
+            print(f"{name:<28} {seconds * 1000:8.1f} ms {requests:4.0f} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compares constructing the Android result types with the slotted, \
+    generated constructors of map_attributes against the original \
+    setattr loop over instances with a __dict__. The sources are zeep objects \
+    of the same shape as those returned by the Android SOAP services.
+
+Run with `python -m benchmarks.android_types [--count N] [--repeat N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable
+
+from zeep import xsd
+
+from zonerama_api.android.android_typing import AccountInfo, AlbumInfo, TabInfo
+
+
+def legacy_map_attributes(mapping: dict[str, str]):
+    # map_attributes as it was before the constructors were generated
+    def decorator(cls: Any):
+        original_init = cls.__init__
+
+        def init_wrapper(
+            self: Any, obj: Any, *args: tuple[Any], **kwargs: dict[str, Any]
+        ):
+            for class_attr, obj_key in mapping.items():
+                setattr(self, class_attr, getattr(obj, obj_key))
+            original_init(self, *args, **kwargs)
+
+        cls.__init__ = init_wrapper
+        return cls
+
+    return decorator
+
+
+def legacy_type(cls: type) -> type:
+    return legacy_map_attributes(cls._attribute_map)(type(cls.__name__, (), {}))
+
+
+def sample_value(cls: type, name: str) -> Any:
+    annotation = str(cls.__annotations__[name])
+    if "datetime" in annotation:
+        return datetime(2024, 1, 1)
+    if "int" in annotation:
+        return 1
+    if "float" in annotation:
+        return 1.0
+    if "bool" in annotation:
+        return True
+    return name
+
+
+def zeep_object(cls: type) -> object:
+    """A zeep object with the attributes cls is constructed from."""
+    mapping: dict[str, str] = cls._attribute_map
+    complex_type = xsd.ComplexType(
+        xsd.Sequence([xsd.Element(key, xsd.AnyType()) for key in mapping.values()])
+    )
+    return complex_type(
+        **{key: sample_value(cls, name) for name, key in mapping.items()}
+    )
+
+
+def measure_memory(construct: Callable[[], list[object]]) -> int:
+    tracemalloc.start()
+    instances = construct()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for cls in (AlbumInfo, AccountInfo, TabInfo):
+        source = zeep_object(cls)
+        for name, implementation in (
+            ("legacy", legacy_type(cls)),
+            ("slotted", cls),
+        ):
+
+            def construct() -> list[object]:
+                return [implementation(source) for _ in range(args.count)]
+
+            seconds = min(timeit.repeat(construct, number=1, repeat=args.repeat))
+            size = measure_memory(construct)
+            print(
+                f"{cls.__name__:<12} {name:<8} "
+                f"{seconds / args.count * 1e6:7.2f} us "
+                f"{size / args.count:7.0f} B per instance"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compares the BeautifulSoup and the lxml parsers \
+    over the saved pages in benchmarks/fixtures. The pages are trimmed \
+    stand-ins for the Zonerama pages, keeping the markup the parsers look for.
+
+Run with `python -m benchmarks.parsers [--repeat N]`.
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+from zonerama_api.album import _parse_album_meta
+from zonerama_api.folder import _parse_folder_info, _parse_folder_page
+from zonerama_api.gallery import _parse_profile, _parse_username
+from zonerama_api.html import Parser
+from zonerama_api.photo import _parse_photo_info
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_FOLDER, f"{name}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def cases() -> dict[str, Callable[[Parser], object]]:
+    album, profile = read_fixture("album"), read_fixture("profile")
+    folder, photo = read_fixture("folder"), read_fixture("photo")
+
+    return {
+        "album meta": lambda parser: _parse_album_meta(album, parser),
+        "profile": lambda parser: _parse_profile("user", profile, parser),
+        "folder info": lambda parser: _parse_folder_info(
+            "user", "1005", profile, parser
+        ),
+        "username": lambda parser: _parse_username(profile, parser),
+        "folder page": lambda parser: _parse_folder_page(folder, parser),
+        "photo info": lambda parser: _parse_photo_info(photo, parser),
+    }
+
+
+def run(case: Callable[[Parser], object], parser: Parser, repeat: int) -> float:
+    began = time.perf_counter()
+    for _ in range(repeat):
+        case(parser)
+    return (time.perf_counter() - began) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, case in cases().items():
+        assert case("bs4") == case("lxml"), name
+
+        bs4 = run(case, "bs4", args.repeat)
+        lxml = run(case, "lxml", args.repeat)
+        print(
+            f"{name:<12} bs4 {bs4 * 1000:8.2f} ms  lxml {lxml * 1000:8.2f} ms  "
+            f"{bs4 / lxml:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compares the single-stream and the segmented ZIP download \
+    against a local stand-in for Zonerama's Zip/Download endpoint, \
+    which caps the bandwidth of each connection like a long-haul route does.
+
+Run with `python -m benchmarks.segmented_download [--size MB] [--rate MB/s]`.
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from zonerama_api.download import (
+    PartialDownload,
+    download_resumable,
+    download_segmented,
+    partial_download_path,
+)
+from zonerama_api.session import ZoneramaSession
+
+BLOCK_SIZE = 64 * 1024
+
+
+def make_handler(data: bytes, rate: float) -> type[BaseHTTPRequestHandler]:
+    class ZipHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            start, end = 0, len(data) - 1
+            mtch = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if mtch is not None:
+                start = int(mtch.group(1))
+                end = int(mtch.group(2)) if mtch.group(2) else end
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                self.send_response(200)
+
+            self.send_header("Content-Type", "application/zip")
+            self.send_header(
+                "Content-Disposition", 'attachment; filename="benchmark.zip"'
+            )
+            self.send_header("Content-Length", str(end + 1 - start))
+            self.send_header("ETag", '"benchmark"')
+            self.end_headers()
+
+            # Caps the bandwidth of this connection to rate bytes per second
+            began = time.perf_counter()
+            for position in range(start, end + 1, BLOCK_SIZE):
+                block = data[position : min(position + BLOCK_SIZE, end + 1)]
+                self.wfile.write(block)
+                sent = position + len(block) - start
+                delay = sent / rate - (time.perf_counter() - began)
+                if delay > 0:
+                    time.sleep(delay)
+
+    return ZipHandler
+
+
+def check_response(response: requests.Response) -> str:
+    assert response.headers["content-type"] == "application/zip"
+    return "benchmark.zip"
+
+
+def run(url: str, segments: int) -> float:
+    with tempfile.TemporaryDirectory() as destination_folder:
+        partial = PartialDownload.load(
+            partial_download_path(destination_folder, "benchmark")
+        )
+        began = time.perf_counter()
+        with ZoneramaSession() as session:
+            if segments == 1:
+                download_resumable(
+                    session, url, partial, destination_folder, check_response
+                )
+            else:
+                download_segmented(
+                    session, url, partial, destination_folder, check_response, segments
+                )
+        return time.perf_counter() - began
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=float, default=32, help="ZIP size in MB")
+    parser.add_argument(
+        "--rate", type=float, default=8, help="bandwidth per connection in MB/s"
+    )
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    size = int(args.size * 1024**2)
+    data = os.urandom(size)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(data, args.rate * 1024**2)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/Zip/Download/benchmark"
+
+    try:
+        for segments in args.segments:
+            elapsed = run(url, segments)
+            print(
+                f"segments={segments:<3} {elapsed:7.2f}s "
+                f"{size / 1024**2 / elapsed:8.2f} MB/s"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
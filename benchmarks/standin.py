@@ -0,0 +1,312 @@
+"""A local stand-in for the Zonerama endpoints used by the library. \
+    Replays the pages saved in benchmarks/fixtures and generates \
+    the JSON responses, photos and ZIP files of a synthetic gallery, \
+    with a configurable latency, bandwidth and ZIP generation delay.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import ModuleType
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
+
+from zonerama_api import album, folder, gallery, photo
+from zonerama_api.retry import DEFAULT_RETRY_POLICIES, endpoint_class
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(__file__), "fixtures")
+ZONERAMA_HOSTS = ("https://zonerama.com", "https://eu.zonerama.com")
+ENDPOINT_MODULES: list[ModuleType] = [album, folder, gallery, photo]
+
+try:
+    from zonerama_api.aio import album as aio_album
+    from zonerama_api.aio import folder as aio_folder
+    from zonerama_api.aio import gallery as aio_gallery
+    from zonerama_api.aio import photo as aio_photo
+except ImportError:  # aiohttp is not installed
+    pass
+else:
+    # They import the URLs of the synchronous modules by name
+    ENDPOINT_MODULES += [aio_album, aio_folder, aio_gallery, aio_photo]
+
+BLOCK_SIZE = 64 * 1024
+JSON_TYPE = "application/json; charset=utf-8"
+HTML_TYPE = "text/html; charset=utf-8"
+
+
+@dataclass
+class StandInConfig:
+    latency: float = 0.0  # seconds before each response
+    bandwidth: float | None = None  # bytes per second per connection
+    zip_delay: float = 0.0  # seconds until a requested ZIP file is ready
+    # The share of the requests answered with a 503, out of those
+    # the default retry policies repeat
+    error_rate: float = 0.0
+    photos_per_album: int = 50
+    photo_size: int = 256 * 1024  # in bytes
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_FOLDER, f"{name}.html"), "rb") as f:
+        return f.read()
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    config: StandInConfig
+    requests: Counter[str]  # by endpoint
+    bytes_sent: int
+    pages: dict[str, bytes]
+    data: bytes  # the contents of every photo and ZIP file
+    etag: str  # of data, change both to simulate a changed file
+    zips: dict[str, float]  # the monotonic time each ZIP file was requested at
+    lock: threading.Lock
+
+    def __init__(self, config: StandInConfig) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.config = config
+        self.pages = {
+            name: read_fixture(name) for name in ("album", "folder", "photo", "profile")
+        }
+        self.data = os.urandom(config.photos_per_album * config.photo_size)
+        self.etag = '"standin"'
+        self.zips = {}
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients close connections early, e.g. after reading only the <head>
+        pass
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.requests = Counter()
+            self.bytes_sent = 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.handle_request()
+
+    def do_POST(self) -> None:
+        self.handle_request()
+
+    def handle_request(self) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode()) if length else {}
+
+        config = self.server.config
+        if config.latency:
+            time.sleep(config.latency)
+
+        for pattern, endpoint, name in ROUTES:
+            mtch = re.fullmatch(pattern, url.path)
+            if mtch is not None and (self.command == "POST") == (
+                endpoint in POST_ENDPOINTS
+            ):
+                with self.server.lock:
+                    self.server.requests[endpoint] += 1
+                if random.random() < config.error_rate and _is_retried(self.path):
+                    self.send_body(503, HTML_TYPE, b"Service unavailable")
+                    return
+                # Looked up by name, so that tests can patch the handlers
+                respond = getattr(self, name)
+                respond(*mtch.groups(), query=query, form=form)
+                return
+
+        self.send_body(404, HTML_TYPE, b"Not found")
+
+    def send_body(
+        self,
+        status: int,
+        content_type: str,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        rate = self.server.config.bandwidth
+        began = time.perf_counter()
+        for position in range(0, len(body), BLOCK_SIZE):
+            block = body[position : position + BLOCK_SIZE]
+            try:
+                self.wfile.write(block)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            with self.server.lock:
+                self.server.bytes_sent += len(block)
+
+            if rate is not None:
+                delay = (position + len(block)) / rate - (time.perf_counter() - began)
+                if delay > 0:
+                    time.sleep(delay)
+
+    def send_json(self, value: object) -> None:
+        self.send_body(200, JSON_TYPE, json.dumps(value).encode())
+
+    def send_file(self, content_type: str, filename: str, data: bytes) -> None:
+        headers = {
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "ETag": self.server.etag,
+            "Accept-Ranges": "bytes",
+        }
+        mtch = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if mtch is None or (if_range is not None and if_range != self.server.etag):
+            self.send_body(200, content_type, data, headers)
+            return
+
+        start = int(mtch.group(1))
+        if start >= len(data):
+            headers["Content-Range"] = f"bytes */{len(data)}"
+            self.send_body(416, HTML_TYPE, b"Range not satisfiable", headers)
+            return
+
+        end = min(int(mtch.group(2)), len(data) - 1) if mtch.group(2) else len(data) - 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        self.send_body(206, content_type, data[start : end + 1], headers)
+
+    # Endpoints
+
+    def album_page(self, album_id: str, **_) -> None:
+        self.send_body(200, HTML_TYPE, self.server.pages["album"])
+
+    def album_size(self, **_) -> None:
+        config = self.server.config
+        size = config.photos_per_album * config.photo_size / 1024**2
+        self.send_json(
+            {
+                "text": f"Předpokládaná velikost archivu {config.photos_per_album} "
+                f"fotek je {size:.2f} MB.".replace(".", ",", 1)
+            }
+        )
+
+    def album_photos(self, form: dict[str, list[str]], **_) -> None:
+        album_id = form["albumId"][0]
+        start = int(form["startIndex"][0])
+        count = min(int(form["count"][0]), self.server.config.photos_per_album - start)
+        self.send_json(
+            {
+                "items": [
+                    {"photoId": f"{album_id}{index:04d}"}
+                    for index in range(start, start + max(count, 0))
+                ]
+            }
+        )
+
+    def zip_request(self, album_id: str, **_) -> None:
+        zip_id = f"{album_id}-{time.monotonic_ns()}"
+        with self.server.lock:
+            self.server.zips[zip_id] = time.monotonic()
+        self.send_json({"Id": zip_id})
+
+    def zip_ready(self, zip_id: str, **_) -> None:
+        requested = self.server.zips.get(zip_id)
+        if requested is None:
+            self.send_json({"Error": "ZipID is invalid", "IsReady": False})
+            return
+
+        ready = time.monotonic() - requested >= self.server.config.zip_delay
+        self.send_json({"Error": None, "IsReady": ready})
+
+    def zip_download(self, zip_id: str, **_) -> None:
+        self.send_file("application/zip", f"{zip_id}.zip", self.server.data)
+
+    def photo_download(self, photo_id: str, **_) -> None:
+        size = self.server.config.photo_size
+        self.send_file("image/jpeg", f"{photo_id}.jpg", self.server.data[:size])
+
+    def photo_info(self, **_) -> None:
+        self.send_body(200, HTML_TYPE, self.server.pages["photo"])
+
+    def folder_page(self, **_) -> None:
+        self.send_body(200, HTML_TYPE, self.server.pages["folder"])
+
+    def folder_unlock(self, **_) -> None:
+        self.send_json({"Success": True})
+
+    def profile_page(self, *_, **__) -> None:
+        self.send_body(200, HTML_TYPE, self.server.pages["profile"])
+
+
+def _is_retried(path: str) -> bool:
+    """Whether the default retry policies repeat a failed request to path. \
+        Actions like requesting a ZIP file are not repeated once sent.
+    """
+    cls = endpoint_class(path)
+    policy = None if cls is None else DEFAULT_RETRY_POLICIES.get(cls)
+    return policy is not None and policy.idempotent and 503 in policy.statuses
+
+
+POST_ENDPOINTS = {"Download/Size", "JSON/FlowLayout_PhotosInAlbum", "Web/UnlockTab"}
+ROUTES = [
+    (r"/Link/Album/([^/]+)", "Link/Album", "album_page"),
+    (r"/Download/Size", "Download/Size", "album_size"),
+    (
+        r"/JSON/FlowLayout_PhotosInAlbum",
+        "JSON/FlowLayout_PhotosInAlbum",
+        "album_photos",
+    ),
+    (r"/Zip/Album/([^/]+)", "Zip/Album", "zip_request"),
+    (r"/Zip/IsReady/([^/]+)", "Zip/IsReady", "zip_ready"),
+    (r"/Zip/Download/([^/]+)", "Zip/Download", "zip_download"),
+    (r"/Download/Photo/([^/]+)", "Download/Photo", "photo_download"),
+    (r"/Part/PhotoOnSlide", "Part/PhotoOnSlide", "photo_info"),
+    (r"/Part/AlbumsInTab", "Part/AlbumsInTab", "folder_page"),
+    (r"/Web/UnlockTab", "Web/UnlockTab", "folder_unlock"),
+    (r"/Profile/(\d+)", "Profile", "profile_page"),
+    (r"/([^/]+)", "profile page", "profile_page"),
+]
+
+
+@contextmanager
+def serve(config: StandInConfig) -> Iterator[StandInServer]:
+    """Runs a stand-in server and points the endpoint URLs \
+        of the library at it for the duration of the block.
+    """
+    server = StandInServer(config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    originals: list[tuple[ModuleType, str, str]] = []
+    for module in ENDPOINT_MODULES:
+        for name, value in list(vars(module).items()):
+            if name.isupper() and isinstance(value, str):
+                for host in ZONERAMA_HOSTS:
+                    if value == host or value.startswith(f"{host}/"):
+                        originals.append((module, name, value))
+                        setattr(module, name, server.base_url + value[len(host) :])
+
+    try:
+        yield server
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+        server.shutdown()
+        server.server_close()
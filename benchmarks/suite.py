@@ -0,0 +1,174 @@
+"""Runs the library against a local stand-in for Zonerama \
+    and reports the wall time, the number of requests \
+    and the bytes transferred of each scenario.
+
+Run with `python -m benchmarks.suite [--latency MS] [--bandwidth MB/s] \
+    [--zip-delay S] [--error-rate R] [--cache] [--scenarios NAME ...] \
+    [--json PATH]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from benchmarks.standin import StandInConfig, StandInServer, serve
+from zonerama_api.album import download_album, get_album_photos
+from zonerama_api.cache import ResponseCache
+from zonerama_api.classes.zonerama_album import ZoneramaAlbum, prefetch_info
+from zonerama_api.classes.zonerama_gallery import ZoneramaGallery
+from zonerama_api.photo import download_photos
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.retry import CircuitBreaker
+from zonerama_api.session import ZoneramaSession
+
+USERNAME = "benchmark"
+FIRST_ALBUM_ID = 10_000_000  # the album IDs in fixtures/folder.html start here
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    wall_time: float  # in seconds
+    requests: dict[str, int]  # by endpoint
+    bytes_sent: int
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+
+Scenario = Callable[[ZoneramaSession, str, argparse.Namespace], object]
+
+
+def list_gallery(
+    session: ZoneramaSession, destination_folder: str, args: argparse.Namespace
+) -> object:
+    return ZoneramaGallery(USERNAME, session).public_albums
+
+
+def album_info(
+    session: ZoneramaSession, destination_folder: str, args: argparse.Namespace
+) -> object:
+    albums = [
+        ZoneramaAlbum(str(FIRST_ALBUM_ID + index), session=session)
+        for index in range(args.albums)
+    ]
+    prefetch_info(albums)
+    return albums
+
+
+def download_zip(
+    session: ZoneramaSession, destination_folder: str, args: argparse.Namespace
+) -> object:
+    return download_album(
+        str(FIRST_ALBUM_ID),
+        destination_folder=destination_folder,
+        session=session,
+        segments=args.segments,
+        polling=PollingStrategy(),
+    )
+
+
+def download_album_photos(
+    session: ZoneramaSession, destination_folder: str, args: argparse.Namespace
+) -> object:
+    photo_ids = get_album_photos(str(FIRST_ALBUM_ID), session)
+    return download_photos(photo_ids, destination_folder, session=session)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list gallery": list_gallery,
+    "album info": album_info,
+    "download album": download_zip,
+    "download photos": download_album_photos,
+}
+
+
+def run(
+    name: str, scenario: Scenario, server: StandInServer, args: argparse.Namespace
+) -> ScenarioResult:
+    with tempfile.TemporaryDirectory() as destination_folder:
+        cache = None
+        if args.cache:
+            cache = ResponseCache(os.path.join(destination_folder, "cache.db"))
+
+        with ZoneramaSession(cache=cache, circuit_breaker=CircuitBreaker()) as session:
+            if cache is not None:
+                # Measure the run answered from the warm cache
+                with tempfile.TemporaryDirectory() as warmup_folder:
+                    scenario(session, warmup_folder, args)
+
+            server.reset_stats()
+            began = time.perf_counter()
+            scenario(session, destination_folder, args)
+            wall_time = time.perf_counter() - began
+
+        if cache is not None:
+            cache.close()
+
+    return ScenarioResult(name, wall_time, dict(server.requests), server.bytes_sent)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--latency", type=float, default=20, help="latency per request in ms"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=None, help="bandwidth per connection in MB/s"
+    )
+    parser.add_argument(
+        "--zip-delay", type=float, default=2, help="ZIP generation time in seconds"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="the share of retried requests answered with a 503",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="measure a second run with the metadata cached",
+    )
+    parser.add_argument("--albums", type=int, default=500, help="for album info")
+    parser.add_argument("--photos", type=int, default=50, help="photos per album")
+    parser.add_argument("--segments", type=int, default=1, help="for download album")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency=args.latency / 1000,
+        bandwidth=None if args.bandwidth is None else args.bandwidth * 1024**2,
+        zip_delay=args.zip_delay,
+        error_rate=args.error_rate,
+        photos_per_album=args.photos,
+    )
+
+    results = []
+    with serve(config) as server:
+        for name in args.scenarios:
+            result = run(name, SCENARIOS[name], server, args)
+            results.append(result)
+            print(
+                f"{name:<16} {result.wall_time:8.2f}s "
+                f"{result.request_count:6} requests "
+                f"{result.bytes_sent / 1024**2:9.2f} MB"
+            )
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import io
+from dataclasses import replace
+from typing import Callable, Iterator
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.standin import StandInConfig, StandInServer, serve
+from zonerama_api.retry import RetryingAdapter
+from zonerama_api.session import ZoneramaSession
+
+# A status code, a (status, headers, body) tuple or an exception to raise
+Answer = int | tuple[int, dict[str, str], bytes] | BaseException
+
+
+class StubAdapter(HTTPAdapter):
+    """Answers each request with the next of answers instead of sending it. \
+        Mixed in below the adapter under test, see stub_session.
+    """
+
+    answers: list[Answer]
+    sent: list[requests.PreparedRequest]
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.answers = []
+        self.sent = []
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        self.sent.append(request)
+        answer = self.answers.pop(0)
+        if isinstance(answer, BaseException):
+            raise answer
+
+        status, headers, body = (answer, {}, b"") if isinstance(answer, int) else answer
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(body)
+        response._content = body
+        return response
+
+
+StubSession = Callable[..., tuple[ZoneramaSession, StubAdapter]]
+
+
+@pytest.fixture
+def stub_session() -> StubSession:
+    """Creates a ZoneramaSession sending its requests through an instance \
+        of adapter_class, created with args and kwargs, \
+        on top of a StubAdapter answering them with answers. \
+        A circuit_breaker keyword argument is also passed to the session.
+    """
+
+    def create(
+        answers: list[Answer],
+        adapter_class: type[HTTPAdapter] = RetryingAdapter,
+        *args,
+        **kwargs,
+    ) -> tuple[ZoneramaSession, StubAdapter]:
+        stubbed_class = type(
+            f"Stubbed{adapter_class.__name__}", (adapter_class, StubAdapter), {}
+        )
+        session = ZoneramaSession(circuit_breaker=kwargs.get("circuit_breaker"))
+        adapter = stubbed_class(*args, **kwargs)
+        adapter.answers = list(answers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session, adapter
+
+    return create
+
+
+@pytest.fixture(scope="module")
+def standin() -> Iterator[StandInServer]:
+    with serve(StandInConfig(photos_per_album=4)) as server:
+        yield server
+
+
+@pytest.fixture
+def server(standin: StandInServer) -> Iterator[StandInServer]:
+    """The stand-in server of the test module with fresh statistics. \
+        Changes to its configuration, ETag and pages are undone afterwards.
+    """
+    config, etag, pages = replace(standin.config), standin.etag, dict(standin.pages)
+    standin.reset_stats()
+    yield standin
+    standin.config, standin.etag, standin.pages = config, etag, pages
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from benchmarks.standin import HTML_TYPE, StandInHandler
+from zonerama_api.batch import download_albums
+from zonerama_api.exceptions import ZipNotReadyException
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.session import ZoneramaSession
+
+ALBUM_IDS = [str(album_id) for album_id in range(1, 7)]
+POLLING = PollingStrategy.fixed(0.01)
+
+
+@pytest.fixture
+def session(server):
+    with ZoneramaSession() as session:
+        yield session
+
+
+def test_lookahead_bounds_the_requested_zip_files(
+    server, session, tmp_path, monkeypatch
+):
+    server.config.zip_delay = 0.1
+    zip_request = StandInHandler.zip_request
+    outstanding = []
+
+    def record(self, album_id, **kwargs):
+        requests = self.server.requests
+        outstanding.append(requests["Zip/Album"] - requests["Zip/Download"])
+        zip_request(self, album_id, **kwargs)
+
+    monkeypatch.setattr(StandInHandler, "zip_request", record)
+
+    result = download_albums(
+        ALBUM_IDS,
+        str(tmp_path),
+        lookahead=2,
+        download_workers=1,
+        polling=POLLING,
+        session=session,
+    )
+
+    assert sorted(result.paths) == ALBUM_IDS
+    assert result.errors == {}
+    # Up to lookahead ZIP files generating or ready, and one being downloaded
+    # whose request may not have reached the server yet
+    assert len(outstanding) == len(ALBUM_IDS)
+    assert max(outstanding) <= 3
+    for path in result.paths.values():
+        assert os.path.getsize(path) == len(server.data)
+
+
+def test_failed_album_does_not_stop_the_others(server, session, tmp_path, monkeypatch):
+    zip_request = StandInHandler.zip_request
+
+    def fail_second(self, album_id, **kwargs):
+        if album_id == "2":
+            self.send_body(404, HTML_TYPE, b"Not found")
+        else:
+            zip_request(self, album_id, **kwargs)
+
+    monkeypatch.setattr(StandInHandler, "zip_request", fail_second)
+    completed = {}
+
+    result = download_albums(
+        ALBUM_IDS,
+        str(tmp_path),
+        polling=POLLING,
+        session=session,
+        on_complete=completed.__setitem__,
+    )
+
+    assert list(result.errors) == ["2"]
+    assert sorted(result.paths) == [
+        album_id for album_id in ALBUM_IDS if album_id != "2"
+    ]
+    assert completed == {**result.paths, **result.errors}
+
+
+def test_zip_not_ready_by_the_deadline_fails_its_album(server, session, tmp_path):
+    server.config.zip_delay = 60
+
+    result = download_albums(
+        ALBUM_IDS[:2],
+        str(tmp_path),
+        polling=PollingStrategy.fixed(0.01, deadline=0.1),
+        session=session,
+    )
+
+    assert result.paths == {}
+    assert sorted(result.errors) == ALBUM_IDS[:2]
+    for e in result.errors.values():
+        assert isinstance(e, ZipNotReadyException)
+    assert server.requests["Zip/Download"] == 0
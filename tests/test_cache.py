@@ -0,0 +1,148 @@
+import os
+from time import time
+
+import pytest
+import requests
+
+from zonerama_api.cache import (
+    DAY,
+    HOUR,
+    CachedResponse,
+    CachingAdapter,
+    ResponseCache,
+    cache_key,
+)
+from zonerama_api.metrics import RequestMetrics
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(os.path.join(tmp_path, "cache.db"))
+    yield cache
+    cache.close()
+
+
+def prepare(url: str, cookies: dict[str, str]) -> requests.PreparedRequest:
+    return requests.Request("GET", url, cookies=cookies).prepare()
+
+
+@pytest.mark.parametrize(
+    "url, ttl",
+    [
+        ("https://zonerama.com/Link/Album/1", DAY),
+        ("https://eu.zonerama.com/Part/AlbumsInTab?tabId=1", HOUR),
+        ("http://127.0.0.1:8000/Part/PhotoOnSlide?photoId=1", 7 * DAY),
+        ("https://eu.zonerama.com/user", HOUR),
+        ("https://zonerama.com/Zip/IsReady/1", None),
+        ("https://zonerama.com/Download/Photo/1", None),
+    ],
+)
+def test_ttl_matches_the_path(cache, url, ttl):
+    assert cache.ttl(url) == ttl
+
+
+def test_fresh_response_is_served_from_the_cache(cache, stub_session):
+    session, adapter = stub_session(
+        [(200, {"ETag": '"1"'}, b"album")], CachingAdapter, cache
+    )
+
+    for _ in range(2):
+        response = session.get("https://zonerama.com/Link/Album/1")
+        assert response.status_code == 200
+        assert response.text == "album"
+        assert response.headers["etag"] == '"1"'
+
+    assert len(adapter.sent) == 1
+
+
+def test_cache_hits_are_not_counted_as_requests(cache, stub_session):
+    session, adapter = stub_session([(200, {}, b"album")], CachingAdapter, cache)
+    session.metrics = RequestMetrics()
+
+    for _ in range(3):
+        session.get("https://zonerama.com/Link/Album/1")
+
+    stats = session.metrics.stats()["Link/Album"]
+    assert stats.requests == 1
+    assert stats.cache_hits == 2
+    assert stats.bytes_in == len(b"album")
+    assert "zonerama_cache_hits_total" in session.metrics.to_prometheus()
+
+
+def test_uncached_endpoints_are_always_sent(cache, stub_session):
+    session, adapter = stub_session([(200, {}, b"{}")] * 3, CachingAdapter, cache)
+
+    session.get("https://zonerama.com/Zip/IsReady/1")
+    session.get("https://zonerama.com/Zip/IsReady/1")
+    session.post("https://zonerama.com/Link/Album/1")
+
+    assert len(adapter.sent) == 3
+
+
+def test_stale_response_is_revalidated(tmp_path, stub_session):
+    cache = ResponseCache(
+        os.path.join(tmp_path, "cache.db"), ttls=[(r"^/Link/Album/", 0)]
+    )
+    session, adapter = stub_session(
+        [(200, {"ETag": '"1"'}, b"album"), (304, {"ETag": '"2"'}, b"")],
+        CachingAdapter,
+        cache,
+    )
+
+    session.get("https://zonerama.com/Link/Album/1")
+    response = session.get("https://zonerama.com/Link/Album/1")
+
+    assert adapter.sent[1].headers["If-None-Match"] == '"1"'
+    assert response.status_code == 200
+    assert response.text == "album"
+    assert response.headers["etag"] == '"2"'
+    cache.close()
+
+
+def test_failed_responses_are_not_cached(cache, stub_session):
+    session, adapter = stub_session(
+        [(404, {}, b""), (200, {}, b"album")], CachingAdapter, cache
+    )
+
+    assert session.get("https://zonerama.com/Link/Album/1").status_code == 404
+    assert session.get("https://zonerama.com/Link/Album/1").status_code == 200
+    assert len(adapter.sent) == 2
+
+
+def test_least_recently_used_responses_are_evicted(cache):
+    cache.max_size = 10
+    for key in ("a", "b"):
+        cache.put(key, CachedResponse(200, {}, b"12345", time() + HOUR))
+    cache.get("a")
+    cache.put("c", CachedResponse(200, {}, b"12345", time() + HOUR))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = os.path.join(tmp_path, "cache.db")
+    cache = ResponseCache(path)
+    cache.put("a", CachedResponse(200, {"etag": '"1"'}, b"album", time() + HOUR))
+    cache.close()
+
+    cache = ResponseCache(path)
+    cached = cache.get("a")
+    cache.close()
+
+    assert cached is not None
+    assert cached.body == b"album"
+    assert cached.validators == {"If-None-Match": '"1"'}
+
+
+def test_cookies_only_key_the_folder_pages():
+    album = "https://zonerama.com/Link/Album/1"
+    folder = "https://eu.zonerama.com/Part/AlbumsInTab?tabId=1"
+
+    assert cache_key(prepare(album, {"session": "1"})) == cache_key(
+        prepare(album, {"session": "2"})
+    )
+    assert cache_key(prepare(folder, {})) != cache_key(
+        prepare(folder, {"tab-1": "unlocked"})
+    )
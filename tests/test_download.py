@@ -0,0 +1,183 @@
+import os
+
+import pytest
+
+from benchmarks.standin import StandInConfig, StandInHandler
+from zonerama_api.album import download_album
+from zonerama_api.download import PartialDownload, partial_download_path
+from zonerama_api.exceptions import IncompleteDownloadException
+from zonerama_api.photo import download_photo, download_photos
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.session import ZoneramaSession
+
+PHOTO_ID = "10000000"
+PHOTO_SIZE = StandInConfig.photo_size
+
+
+@pytest.fixture
+def session(server):
+    with ZoneramaSession() as session:
+        yield session
+
+
+@pytest.fixture
+def photo(server) -> bytes:
+    return server.data[:PHOTO_SIZE]
+
+
+def photo_partial(folder: str) -> PartialDownload:
+    return PartialDownload.load(partial_download_path(folder, f"photo-{PHOTO_ID}"))
+
+
+def start_partial(folder: str, data: bytes, etag: str = '"standin"') -> None:
+    """Leaves the state of a photo download interrupted after data."""
+    partial = photo_partial(folder)
+    with open(partial.path, "wb") as f:
+        f.write(data)
+    partial.filename = f"{PHOTO_ID}.jpg"
+    partial.expected_size = PHOTO_SIZE
+    partial.etag = etag
+    partial.save()
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download_is_renamed_into_place(session, photo, tmp_path):
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert path == os.path.join(tmp_path, f"{PHOTO_ID}.jpg")
+    assert read(path) == photo
+    # Neither the partial file nor its sidecar is left behind
+    assert os.listdir(tmp_path) == [f"{PHOTO_ID}.jpg"]
+
+
+def test_resumes_from_the_partial_file(server, session, photo, tmp_path):
+    start_partial(str(tmp_path), photo[:1000])
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert read(path) == photo
+    assert server.bytes_sent == PHOTO_SIZE - 1000
+
+
+def test_restarts_if_the_file_has_changed(server, session, photo, tmp_path):
+    # If-Range does not match, so the server sends the whole new file
+    start_partial(str(tmp_path), b"\0" * 1000, etag='"old"')
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert read(path) == photo
+    assert server.bytes_sent == PHOTO_SIZE
+
+
+def test_restarts_if_the_range_is_not_satisfiable(server, session, photo, tmp_path):
+    start_partial(str(tmp_path), b"\0" * (PHOTO_SIZE + 10))
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert read(path) == photo
+    assert server.requests["Download/Photo"] == 2
+
+
+def test_restarts_on_a_wrong_content_range(
+    server, session, photo, tmp_path, monkeypatch
+):
+    send_file = StandInHandler.send_file
+
+    def send_from_start(self, *args, **kwargs):
+        if "Range" in self.headers:
+            self.headers.replace_header("Range", "bytes=0-")
+        send_file(self, *args, **kwargs)
+
+    monkeypatch.setattr(StandInHandler, "send_file", send_from_start)
+    start_partial(str(tmp_path), b"\0" * 1000)
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert read(path) == photo
+    assert server.requests["Download/Photo"] == 2
+
+
+def test_interrupted_download_keeps_its_state(
+    server, session, photo, tmp_path, monkeypatch
+):
+    def send_half(self, content_type, filename, data):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", self.server.etag)
+        self.end_headers()
+        self.wfile.write(data[: len(data) // 2])
+        self.close_connection = True
+
+    with monkeypatch.context() as m:
+        m.setattr(StandInHandler, "send_file", send_half)
+        with pytest.raises(IncompleteDownloadException):
+            download_photo(PHOTO_ID, str(tmp_path), session, chunk_size=16 * 1024)
+
+    partial = photo_partial(str(tmp_path))
+    assert partial.filename == f"{PHOTO_ID}.jpg"
+    assert partial.expected_size == PHOTO_SIZE
+    assert partial.etag == '"standin"'
+    # The chunk being read when the connection was closed is lost
+    offset = partial.offset
+    assert 0 < offset <= PHOTO_SIZE // 2
+
+    server.reset_stats()
+    path = download_photo(PHOTO_ID, str(tmp_path), session)
+
+    assert read(path) == photo
+    assert server.bytes_sent == PHOTO_SIZE - offset
+    assert os.listdir(tmp_path) == [f"{PHOTO_ID}.jpg"]
+
+
+def test_skip_existing_probes_a_single_byte(server, session, photo, tmp_path):
+    download_photo(PHOTO_ID, str(tmp_path), session)
+    server.reset_stats()
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session, skip_existing=True)
+
+    assert read(path) == photo
+    assert server.requests["Download/Photo"] == 1
+    assert server.bytes_sent == 1
+
+
+def test_skip_existing_does_not_probe_an_empty_folder(server, session, tmp_path):
+    photo_ids = [f"1000000{index}" for index in range(4)]
+
+    download_photos(photo_ids, str(tmp_path), workers=2, session=session)
+    assert server.requests["Download/Photo"] == 4
+    assert server.bytes_sent == 4 * PHOTO_SIZE
+
+    server.reset_stats()
+    download_photos(photo_ids, str(tmp_path), workers=2, session=session)
+    assert server.requests["Download/Photo"] == 4
+    assert server.bytes_sent == 4
+
+
+def test_skip_existing_downloads_an_incomplete_file(server, session, photo, tmp_path):
+    with open(os.path.join(tmp_path, f"{PHOTO_ID}.jpg"), "wb") as f:
+        f.write(photo[:1000])
+
+    path = download_photo(PHOTO_ID, str(tmp_path), session, skip_existing=True)
+
+    assert read(path) == photo
+
+
+def test_segmented_download(server, session, tmp_path):
+    path = download_album(
+        "1",
+        destination_folder=str(tmp_path),
+        session=session,
+        segments=4,
+        polling=PollingStrategy.fixed(0.01),
+    )
+
+    assert read(path) == server.data
+    # The probe and one request per segment
+    assert server.requests["Zip/Download"] == 5
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
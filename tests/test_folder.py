@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from zonerama_api.aio.folder import get_folder_albums as get_folder_albums_async
+from zonerama_api.aio.session import create_session
+from zonerama_api.exceptions import ZoneramaFolderLockedException
+from zonerama_api.folder import get_folder_albums
+from zonerama_api.session import ZoneramaSession
+
+LOCK_ICON = b'<i class="icon-lock"></i>'
+
+
+@pytest.fixture
+def locked(server):
+    """Makes the folder page show the lock icon, even once unlocked."""
+    server.pages["folder"] = LOCK_ICON + server.pages["folder"]
+    server.reset_stats()
+
+
+@pytest.fixture
+def albums(server) -> list[str]:
+    with ZoneramaSession() as session:
+        return get_folder_albums("1", session=session)
+
+
+@pytest.mark.parametrize("parser", ["lxml", "bs4"])
+def test_locked_folder_needs_a_password(locked, parser):
+    with ZoneramaSession() as session, pytest.raises(ZoneramaFolderLockedException):
+        get_folder_albums("1", session=session, parser=parser)
+
+
+@pytest.mark.parametrize("parser", ["lxml", "bs4"])
+def test_unlocked_folder_lists_its_albums(server, albums, locked, parser):
+    with ZoneramaSession() as session:
+        unlocked = get_folder_albums("1", password="pw", session=session, parser=parser)
+
+    assert unlocked == albums
+    assert server.requests["Web/UnlockTab"] == 1
+    assert server.requests["Part/AlbumsInTab"] == 2
+
+
+def test_unlocked_folder_lists_its_albums_async(server, albums, locked):
+    async def get() -> list[str]:
+        async with create_session() as session:
+            return await get_folder_albums_async("1", password="pw", session=session)
+
+    assert asyncio.run(get()) == albums
+    assert server.requests["Web/UnlockTab"] == 1
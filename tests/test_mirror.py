@@ -0,0 +1,118 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.standin import HTML_TYPE, StandInHandler
+from zonerama_api import mirror
+from zonerama_api.classes.zonerama_album import ZoneramaAlbum
+from zonerama_api.mirror import MANIFEST_NAME, Manifest, mirror_album, mirror_gallery
+from zonerama_api.session import ZoneramaSession
+
+ALBUM_ID = "1"
+PHOTO_IDS = [f"1{index:04d}" for index in range(4)]
+
+
+@pytest.fixture
+def session(server):
+    with ZoneramaSession() as session:
+        yield session
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with Manifest(os.path.join(tmp_path, MANIFEST_NAME)) as manifest:
+        yield manifest
+
+
+def mirror_once(session, tmp_path, manifest) -> mirror.MirrorResult:
+    album = ZoneramaAlbum(ALBUM_ID, session=session)
+    return mirror_album(album, str(tmp_path), manifest, session=session)
+
+
+def photo_path(tmp_path, photo_id: str) -> str:
+    return os.path.join(tmp_path, ALBUM_ID, f"{photo_id}.jpg")
+
+
+def test_complete_album_is_skipped_after_one_request(
+    server, session, tmp_path, manifest
+):
+    result = mirror_once(session, tmp_path, manifest)
+    assert result.photos_downloaded == 4
+    assert result.errors == {}
+
+    server.reset_stats()
+    result = mirror_once(session, tmp_path, manifest)
+
+    assert result.albums_skipped == 1
+    assert dict(server.requests) == {"Download/Size": 1}
+
+
+def test_deleted_and_truncated_photos_are_fetched_again(
+    server, session, tmp_path, manifest
+):
+    mirror_once(session, tmp_path, manifest)
+    os.remove(photo_path(tmp_path, PHOTO_IDS[0]))
+    with open(photo_path(tmp_path, PHOTO_IDS[1]), "r+b") as f:
+        f.truncate(1000)
+
+    server.reset_stats()
+    result = mirror_once(session, tmp_path, manifest)
+
+    assert result.photos_downloaded == 2
+    assert result.photos_skipped == 2
+    assert server.requests["Download/Photo"] == 2
+    for photo_id in PHOTO_IDS:
+        assert (
+            os.path.getsize(photo_path(tmp_path, photo_id)) == server.config.photo_size
+        )
+
+
+def test_interrupted_album_resumes_only_the_missing_photos(
+    server, session, tmp_path, manifest, monkeypatch
+):
+    photo_download = StandInHandler.photo_download
+
+    def fail_last(self, photo_id, **kwargs):
+        if photo_id == PHOTO_IDS[-1]:
+            self.send_body(200, HTML_TYPE, b"Not found")
+        else:
+            photo_download(self, photo_id, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(StandInHandler, "photo_download", fail_last)
+        result = mirror_once(session, tmp_path, manifest)
+    assert list(result.errors) == [PHOTO_IDS[-1]]
+    assert result.photos_downloaded == 3
+
+    server.reset_stats()
+    result = mirror_once(session, tmp_path, manifest)
+
+    assert result.photos_downloaded == 1
+    assert result.photos_skipped == 3
+    assert server.requests["Download/Photo"] == 1
+    assert server.bytes_sent - server.config.photo_size < 1024
+
+
+def test_failed_album_does_not_stop_the_gallery(server, session, tmp_path, monkeypatch):
+    album_photos = StandInHandler.album_photos
+
+    def fail_second(self, form, **kwargs):
+        if form["albumId"] == ["2"]:
+            self.send_body(404, HTML_TYPE, b"Not found")
+        else:
+            album_photos(self, form, **kwargs)
+
+    monkeypatch.setattr(StandInHandler, "album_photos", fail_second)
+    albums = [ZoneramaAlbum(album_id, session=session) for album_id in "123"]
+    monkeypatch.setattr(
+        mirror, "ZoneramaGallery", lambda *_: SimpleNamespace(public_albums=albums)
+    )
+
+    result = mirror_gallery("user", str(tmp_path), session=session)
+
+    assert list(result.album_errors) == ["2"]
+    assert result.photos_downloaded == 8
+    assert sorted(os.listdir(tmp_path / "3")) == [
+        f"3{index:04d}.jpg" for index in range(4)
+    ]
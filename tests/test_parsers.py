@@ -0,0 +1,35 @@
+import pytest
+
+from benchmarks.parsers import cases, read_fixture
+from zonerama_api.album import (
+    AlbumSize,
+    _album_downloadable_from_meta,
+    _album_info_from_meta,
+    _parse_album_meta,
+)
+from zonerama_api.folder import _parse_folder_page
+
+PARSERS = ["lxml", "bs4"]
+
+
+@pytest.mark.parametrize("name", list(cases()))
+def test_parsers_agree_on_the_fixtures(name):
+    case = cases()[name]
+    assert case("bs4") == case("lxml")
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_album_fixture_has_the_meta_read_by_the_library(parser):
+    meta = _parse_album_meta(read_fixture("album"), parser)
+
+    assert _album_downloadable_from_meta(meta)
+    _album_info_from_meta(meta, AlbumSize(0, False, 0, 0))
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_folder_fixture_lists_albums(parser):
+    albums = _parse_folder_page(read_fixture("folder"), parser)
+
+    assert albums is not None
+    assert albums[0] == "10000000"
+    assert len(albums) == len(set(albums))
@@ -0,0 +1,37 @@
+import pytest
+
+from zonerama_api import polling
+from zonerama_api.album import _zip_polling
+from zonerama_api.polling import DEFAULT_DEADLINE, PollingStrategy
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(polling, "monotonic", lambda: now[0])
+    monkeypatch.setattr(
+        polling, "sleep", lambda seconds: now.__setitem__(0, now[0] + seconds)
+    )
+    return now
+
+
+def test_default_strategies_give_up():
+    assert PollingStrategy().deadline == DEFAULT_DEADLINE
+    assert PollingStrategy.fixed(5).deadline == DEFAULT_DEADLINE
+    assert _zip_polling(None, None).deadline == DEFAULT_DEADLINE
+    assert _zip_polling(None, 5).deadline == DEFAULT_DEADLINE
+
+
+def test_wait_gives_up_at_the_deadline(clock):
+    strategy = PollingStrategy.fixed(10, deadline=35)
+
+    assert not strategy.wait(lambda: False)
+    assert clock[0] == 35
+
+
+def test_wait_polls_forever_without_a_deadline(clock):
+    polls = iter(range(1000))
+    strategy = PollingStrategy(initial=1, deadline=None)
+
+    assert strategy.wait(lambda: next(polls) == 999)
+    assert clock[0] > DEFAULT_DEADLINE
@@ -0,0 +1,129 @@
+import asyncio
+from email.utils import formatdate
+from time import perf_counter, time
+
+import pytest
+
+from zonerama_api import ratelimit
+from zonerama_api.ratelimit import MIN_RATE, RateLimiter, parse_retry_after
+
+HOST = "zonerama.com"
+
+
+class FakeClock:
+    """Stands in for monotonic and sleep, sleeping advances the time."""
+
+    now: float
+    sleeps: list[float]
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_is_sent_at_once(clock):
+    limiter = RateLimiter(rate=10, burst=5)
+    for _ in range(5):
+        limiter.acquire(HOST)
+    assert clock.sleeps == []
+
+    limiter.acquire(HOST)
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def test_requests_are_paced_at_the_rate(clock):
+    limiter = RateLimiter(rate=10, burst=1)
+    for _ in range(21):
+        limiter.acquire(HOST)
+    assert clock.now - 1000.0 == pytest.approx(2.0)
+
+
+def test_hosts_have_their_own_buckets(clock):
+    limiter = RateLimiter(rate=10, burst=1, rates={"eu.zonerama.com": 2})
+    limiter.acquire(HOST)
+    limiter.acquire("eu.zonerama.com")
+    assert clock.sleeps == []
+
+    limiter.acquire("eu.zonerama.com")
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_throttling_halves_the_rate_and_pauses_the_host(clock):
+    limiter = RateLimiter(rate=10, burst=5)
+    limiter.feedback(HOST, 429, "3")
+
+    stats = limiter.stats()[HOST]
+    assert stats.rate == 5
+    assert stats.max_rate == 10
+    assert stats.blocked_for == pytest.approx(3.0)
+    assert stats.throttled == 1
+
+    # The pause applies even though the burst was never used
+    limiter.acquire(HOST)
+    assert clock.sleeps == [pytest.approx(3.2)]
+
+
+def test_rate_recovers_with_other_responses(clock):
+    limiter = RateLimiter(rate=10)
+    for _ in range(10):
+        limiter.feedback(HOST, 503, "0")
+    assert limiter.stats()[HOST].rate == MIN_RATE
+
+    for _ in range(100):
+        limiter.feedback(HOST, 200, None)
+    assert limiter.stats()[HOST].rate == 10
+
+
+def test_stats_count_the_waiting_requests(clock, monkeypatch):
+    limiter = RateLimiter(rate=10, burst=1)
+    depths = []
+    monkeypatch.setattr(
+        ratelimit, "sleep", lambda _: depths.append(limiter.stats()[HOST].queue_depth)
+    )
+
+    limiter.acquire(HOST)
+    limiter.acquire(HOST)
+
+    assert depths == [1]
+    assert limiter.stats()[HOST].queue_depth == 0
+
+
+def test_async_requests_are_paced():
+    limiter = RateLimiter(rate=100, burst=1)
+
+    async def acquire_all() -> None:
+        await asyncio.gather(*(limiter.acquire_async(HOST) for _ in range(6)))
+
+    began = perf_counter()
+    asyncio.run(acquire_all())
+    assert perf_counter() - began >= 0.05
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [(None, None), ("120", 120.0), (" 5 ", 5.0), ("soon", None), ("", None)],
+)
+def test_parse_retry_after(value, seconds):
+    assert parse_retry_after(value) == seconds
+
+
+def test_parse_retry_after_date():
+    assert parse_retry_after(formatdate(time() + 60, usegmt=True)) == pytest.approx(
+        60, abs=2
+    )
+    assert parse_retry_after(formatdate(time() - 60, usegmt=True)) == 0.0
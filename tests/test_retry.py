@@ -0,0 +1,142 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from zonerama_api import retry
+from zonerama_api.exceptions import (
+    CircuitOpenException,
+    InvalidZoneramaFolderIdException,
+)
+from zonerama_api.folder import get_folder_albums
+from zonerama_api.retry import (
+    DEFAULT_RETRY_POLICIES,
+    CircuitBreaker,
+    RetryPolicy,
+    endpoint_class,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(retry, "sleep", delays.append)
+    return delays
+
+
+def connect_error() -> requests.ConnectionError:
+    reason = NewConnectionError(None, "refused")
+    return requests.ConnectionError(MaxRetryError(None, "/", reason))
+
+
+@pytest.mark.parametrize(
+    "url, cls",
+    [
+        ("https://zonerama.com/Link/Album/1", "metadata"),
+        ("https://eu.zonerama.com/Part/AlbumsInTab?tabId=1", "folder"),
+        ("https://zonerama.com/Zip/IsReady/1", "polling"),
+        ("https://zonerama.com/Zip/Download/1", "download"),
+        ("https://zonerama.com/Download/Photo/1", "download"),
+        ("https://zonerama.com/Zip/Album/1", "action"),
+        ("http://127.0.0.1:8000/Web/UnlockTab", "action"),
+    ],
+)
+def test_endpoint_class_matches_the_path(url, cls):
+    assert endpoint_class(url) == cls
+
+
+def test_delay_grows_and_is_capped():
+    policy = RetryPolicy(backoff=1.0, factor=2.0, max_backoff=5.0, jitter=0.0)
+    assert [policy.delay(retry) for retry in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_delay_honours_retry_after_up_to_the_cap():
+    policy = RetryPolicy(backoff=1.0, max_backoff=10.0, jitter=0.0)
+    assert policy.delay(0, "3") == 3.0
+    assert policy.delay(0, "60") == 10.0
+
+
+def test_transient_status_is_retried(no_sleep, stub_session):
+    session, adapter = stub_session([502, 503, 200])
+    response = session.get("https://zonerama.com/Link/Album/1")
+
+    assert response.status_code == 200
+    assert len(adapter.sent) == 3
+    assert len(no_sleep) == 2
+
+
+def test_gives_up_after_the_retries_of_the_policy(stub_session):
+    session, adapter = stub_session([502] * 10)
+    response = session.get("https://zonerama.com/Link/Album/1")
+
+    assert response.status_code == 502
+    assert len(adapter.sent) == DEFAULT_RETRY_POLICIES["metadata"].retries + 1
+
+
+def test_action_is_not_retried_once_sent(stub_session):
+    session, adapter = stub_session([502, requests.ReadTimeout()])
+    assert session.get("https://zonerama.com/Zip/Album/1").status_code == 502
+    with pytest.raises(requests.ReadTimeout):
+        session.get("https://zonerama.com/Zip/Album/1")
+    assert len(adapter.sent) == 2
+
+
+def test_action_is_retried_if_it_never_connected(stub_session):
+    session, adapter = stub_session([connect_error(), 200])
+    assert session.get("https://zonerama.com/Zip/Album/1").status_code == 200
+    assert len(adapter.sent) == 2
+
+
+def test_deleted_folder_is_neither_retried_nor_a_failure(stub_session):
+    breaker = CircuitBreaker(failure_threshold=1)
+    session, adapter = stub_session([500, 500], circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(InvalidZoneramaFolderIdException):
+            get_folder_albums("user", "1", session=session)
+
+    assert len(adapter.sent) == 2
+    assert not breaker.is_open("eu.zonerama.com")
+
+
+def test_circuit_opens_after_consecutive_failures(stub_session):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    session, adapter = stub_session([502] * 4, circuit_breaker=breaker)
+
+    # The second attempt opens the circuit, so the first retry is refused
+    with pytest.raises(CircuitOpenException):
+        session.get("https://zonerama.com/Link/Album/1")
+    assert breaker.is_open("zonerama.com")
+    assert len(adapter.sent) == 2
+
+    with pytest.raises(CircuitOpenException):
+        session.get("https://zonerama.com/Link/Album/2")
+    assert len(adapter.sent) == 2
+
+
+def test_circuit_lets_a_single_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("zonerama.com")
+
+    breaker.before_request("zonerama.com")
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request("zonerama.com")
+
+    breaker.record_success("zonerama.com")
+    assert not breaker.is_open("zonerama.com")
+    breaker.before_request("zonerama.com")
+
+
+def test_unexpected_exception_ends_the_trial(stub_session):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("zonerama.com")
+    session, adapter = stub_session(
+        [requests.exceptions.InvalidHeader("bad"), 200], circuit_breaker=breaker
+    )
+
+    with pytest.raises(requests.exceptions.InvalidHeader):
+        session.get("https://zonerama.com/Link/Album/1")
+    # The trial failed, so the circuit is open again but may be tried again
+    assert breaker.is_open("zonerama.com")
+
+    assert session.get("https://zonerama.com/Link/Album/1").status_code == 200
+    assert not breaker.is_open("zonerama.com")
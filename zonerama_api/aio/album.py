@@ -0,0 +1,309 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator
+
+import aiohttp
+
+from zonerama_api.aio.download import download_resumable
+from zonerama_api.aio.session import encode, resolve_session
+from zonerama_api.album import (
+    ALBUM_BASE_URL,
+    ALBUM_PHOTO_LIST_URL,
+    DEFAULT_PAGE_SIZE,
+    ZIP_DOWNLOAD_URL,
+    ZIP_READY_URL,
+    ZIP_REQUEST_URL,
+    ZIP_SIZE_URL,
+    AlbumInfo,
+    AlbumSize,
+    _album_download_source,
+    _album_info_from_meta,
+    _album_size_data,
+    _parse_album_meta,
+    _parse_album_photos,
+    _parse_album_size,
+    _parse_zip_filename,
+    _parse_zip_ready,
+    _raise_for_zip_error,
+    _zip_polling,
+    _zip_request_params,
+)
+from zonerama_api.download import (
+    DEFAULT_CHUNK_SIZE,
+    PartialDownload,
+    partial_download_path,
+)
+from zonerama_api.exceptions import (
+    InvalidZipIdException,
+    SecretIdNotSpecifiedException,
+    ZipNotReadyException,
+)
+from zonerama_api.html import DEFAULT_PARSER, Parser
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.typing import AlbumId, PhotoId, SecretId, ZipId
+
+
+async def get_album_info(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: aiohttp.ClientSession | None = None,
+) -> AlbumInfo:
+    meta, size = await asyncio.gather(
+        get_album_meta(album_id, secret_id, session),
+        get_album_size(album_id, True, True, secret_id, session),
+    )
+    return _album_info_from_meta(meta, size)
+
+
+async def get_album_size(
+    album_id: AlbumId,
+    videos: bool = True,
+    raws: bool = False,
+    secret_id: SecretId | None = None,
+    session: aiohttp.ClientSession | None = None,
+) -> AlbumSize:
+    async with resolve_session(session).post(
+        ZIP_SIZE_URL, data=encode(_album_size_data(album_id, videos, raws, secret_id))
+    ) as response:
+        if response.headers["content-type"] != "application/json; charset=utf-8":
+            raise SecretIdNotSpecifiedException()
+
+        json = await response.json()
+
+    return _parse_album_size(json["text"], videos)
+
+
+async def get_album_meta(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: aiohttp.ClientSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> dict[str, str]:
+    async with resolve_session(session).get(
+        f"{ALBUM_BASE_URL}/{album_id}",
+        params=encode({"secret": secret_id}),
+        allow_redirects=False,
+    ) as response:
+        response.raise_for_status()
+
+        if response.status == 302:
+            raise SecretIdNotSpecifiedException()
+
+        html = await response.text()
+
+    return _parse_album_meta(html, parser)
+
+
+async def get_album_photos(
+    album_id: AlbumId, session: aiohttp.ClientSession | None = None
+) -> list[PhotoId]:
+    async with resolve_session(session).post(
+        ALBUM_PHOTO_LIST_URL,
+        data=encode({"albumId": album_id, "startIndex": 0, "count": 999_999_999}),
+    ) as response:
+        # Like requests, does not insist on a JSON content type
+        json = await response.json(content_type=None)
+
+    return _parse_album_photos(json)
+
+
+async def iter_album_items(
+    album_id: AlbumId,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """An asynchronous version of zonerama_api.album.iter_album_items. \
+        See it for the description of the arguments.
+    """
+    session = resolve_session(session)
+
+    start_index = 0
+    page = asyncio.ensure_future(
+        _fetch_album_items(album_id, start_index, page_size, session)
+    )
+    try:
+        while True:
+            items = await page
+            start_index += len(items)
+            last = len(items) < page_size
+
+            if not last and prefetch:
+                page = asyncio.ensure_future(
+                    _fetch_album_items(album_id, start_index, page_size, session)
+                )
+
+            for item in items:
+                yield item
+
+            if last:
+                return
+
+            if not prefetch:
+                page = asyncio.ensure_future(
+                    _fetch_album_items(album_id, start_index, page_size, session)
+                )
+    finally:
+        page.cancel()
+
+
+async def iter_album_photos(
+    album_id: AlbumId,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[PhotoId]:
+    """An asynchronous version of zonerama_api.album.iter_album_photos. \
+        See it for the description of the arguments.
+    """
+    async for item in iter_album_items(album_id, page_size, prefetch, session):
+        if "photoId" in item:
+            yield PhotoId(item["photoId"])
+
+
+async def _fetch_album_items(
+    album_id: AlbumId,
+    start_index: int,
+    count: int,
+    session: aiohttp.ClientSession,
+) -> list[dict[str, Any]]:
+    async with session.post(
+        ALBUM_PHOTO_LIST_URL,
+        data=encode({"albumId": album_id, "startIndex": start_index, "count": count}),
+    ) as response:
+        response.raise_for_status()
+
+        json = await response.json(content_type=None)
+
+    return json["items"]
+
+
+async def _get_zip_id(
+    album_id: str,
+    secret_id: str | None = None,
+    include_videos: bool = True,
+    original: bool = False,
+    av1: bool = False,
+    raw: bool = False,
+    session: aiohttp.ClientSession | None = None,
+) -> ZipId:
+    async with resolve_session(session).get(
+        f"{ZIP_REQUEST_URL}/{album_id}",
+        params=encode(
+            _zip_request_params(secret_id, include_videos, original, av1, raw)
+        ),
+    ) as response:
+        response.raise_for_status()
+
+        # Does not return a JSON if the album is secret
+        # and no secret id was specified. Instead redirects to home page.
+        if response.headers["content-type"] != "application/json; charset=utf-8":
+            raise SecretIdNotSpecifiedException()
+
+        json = await response.json()
+
+    return json["Id"]
+
+
+async def _is_zip_ready(
+    zip_id: ZipId, session: aiohttp.ClientSession | None = None
+) -> bool:
+    async with resolve_session(session).get(f"{ZIP_READY_URL}/{zip_id}") as response:
+        response.raise_for_status()
+
+        if response.headers["content-type"] != "application/json; charset=utf-8":
+            raise InvalidZipIdException(zip_id)
+
+        json = await response.json()
+
+    return _parse_zip_ready(zip_id, json)
+
+
+async def _download_zip(
+    zip_id: ZipId,
+    destination_folder: str,
+    session: aiohttp.ClientSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    partial: PartialDownload | None = None,
+) -> str:
+    if partial is None:
+        partial = PartialDownload.load(
+            partial_download_path(destination_folder, f"zip-{zip_id}")
+        )
+
+    async def check_response(response: aiohttp.ClientResponse) -> str:
+        if response.headers["content-type"] == "text/html; charset=utf-8":
+            _raise_for_zip_error(zip_id, await response.text())
+
+        return _parse_zip_filename(response.headers)
+
+    return await download_resumable(
+        resolve_session(session),
+        f"{ZIP_DOWNLOAD_URL}/{zip_id}",
+        partial,
+        destination_folder,
+        check_response,
+        chunk_size,
+    )
+
+
+async def download_album(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    include_videos: bool = True,
+    original: bool = False,
+    av1: bool = False,
+    raw: bool = False,
+    destination_folder: str = os.getcwd(),
+    sleep_for: float | None = None,
+    session: aiohttp.ClientSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    polling: PollingStrategy | None = None,
+) -> str:
+    """An asynchronous version of zonerama_api.album.download_album. \
+        See it for the description of the arguments.
+
+    Raises:
+        ZipNotReadyException: The ZIP file was not ready before the deadline \
+            of the polling strategy.
+
+    Returns:
+        str: The path of the downloaded ZIP file.
+    """
+    source = _album_download_source(album_id, include_videos, original, av1, raw)
+    partial = PartialDownload.load(
+        partial_download_path(destination_folder, f"album-{album_id}")
+    )
+    if not resume or partial.source != source:
+        partial.reset(source)
+
+    zip_id = partial.zip_id
+    ready = False
+    if zip_id is not None:
+        try:
+            ready = await _is_zip_ready(zip_id, session)
+        except InvalidZipIdException:
+            # The ZIP file has expired on the server
+            partial.reset(source)
+            zip_id = None
+
+    if zip_id is None:
+        zip_id = await _get_zip_id(
+            album_id, secret_id, include_videos, original, av1, raw, session
+        )
+        partial.zip_id = zip_id
+        partial.save()
+
+    if not ready:
+        polling = _zip_polling(polling, sleep_for)
+        if polling.initial is None:
+            size = await get_album_size(
+                album_id, include_videos, raw, secret_id, session
+            )
+            polling = polling.scaled_to(size.zip_size)
+
+        if not await polling.wait_async(lambda: _is_zip_ready(zip_id, session)):
+            raise ZipNotReadyException(zip_id)
+
+    return await _download_zip(zip_id, destination_folder, session, chunk_size, partial)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Awaitable, Callable
+
+import aiohttp
+
+from zonerama_api.download import (
+    DEFAULT_CHUNK_SIZE,
+    PROBE_HEADERS,
+    PartialDownload,
+    content_range_start,
+    expected_size,
+    has_downloads,
+    is_complete,
+    range_headers,
+)
+from zonerama_api.exceptions import IncompleteDownloadException
+
+
+async def download_resumable(
+    session: aiohttp.ClientSession,
+    url: str,
+    partial: PartialDownload,
+    destination_folder: str,
+    check_response: Callable[[aiohttp.ClientResponse], Awaitable[str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_existing: bool = False,
+) -> str:
+    """An asynchronous version of zonerama_api.download.download_resumable. \
+        Disk writes are done in a worker thread, so they do not block the event loop.
+
+    Args:
+        session (aiohttp.ClientSession): The session to send the request with.
+        url (str): The URL of the file.
+        partial (PartialDownload): The state of the partial download.
+        destination_folder (str): The destination folder for the file.
+        check_response (Callable[[aiohttp.ClientResponse], Awaitable[str]]): \
+            Validates the response and returns the name of the file.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream the file to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        skip_existing (bool, optional): Whether to skip downloading the body \
+            if a file of the same name and size already exists. \
+            Defaults to False.
+
+    Raises:
+        IncompleteDownloadException: The connection was closed \
+            before the whole file was received. The partial file is kept.
+
+    Returns:
+        str: The path of the downloaded file.
+    """
+    offset = partial.offset
+    # A new file is decided on from the headers of the download itself
+    if skip_existing and offset == 0 and has_downloads(destination_folder):
+        path = await _probe_existing(session, url, destination_folder, check_response)
+        if path is not None:
+            partial.discard()
+            return path
+
+    async with session.get(url, headers=range_headers(partial)) as response:
+        restart = offset > 0 and response.status == 416
+        if not restart:
+            response.raise_for_status()
+            filename = await check_response(response)
+
+            path = os.path.join(destination_folder, filename)
+            if skip_existing and is_complete(path, response.status, response.headers):
+                partial.discard()
+                return path
+
+            if response.status == 206:
+                restart = content_range_start(response.headers) != offset
+            else:
+                # The server ignored the Range header or the file has changed
+                offset = 0
+
+        if not restart:
+            partial.filename = filename
+            partial.expected_size = expected_size(
+                response.status, response.headers, offset
+            )
+            partial.etag = response.headers.get("etag")
+            partial.last_modified = response.headers.get("last-modified")
+            partial.save()
+
+            try:
+                with open(partial.path, "r+b" if offset > 0 else "wb") as df:
+                    df.seek(offset)
+                    df.truncate()
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await asyncio.to_thread(df.write, chunk)
+            except aiohttp.ClientError as e:
+                raise IncompleteDownloadException(url, partial.path) from e
+
+    if restart:
+        partial.truncate()
+        return await download_resumable(
+            session,
+            url,
+            partial,
+            destination_folder,
+            check_response,
+            chunk_size,
+            skip_existing,
+        )
+
+    size = os.path.getsize(partial.path)
+    if partial.expected_size is not None and size != partial.expected_size:
+        raise IncompleteDownloadException(url, partial.path)
+
+    os.replace(partial.path, path)
+    partial.discard()
+    return path
+
+
+async def _probe_existing(
+    session: aiohttp.ClientSession,
+    url: str,
+    destination_folder: str,
+    check_response: Callable[[aiohttp.ClientResponse], Awaitable[str]],
+) -> str | None:
+    """An asynchronous version of zonerama_api.download._probe_existing."""
+    async with session.get(url, headers=PROBE_HEADERS) as response:
+        if response.status not in (200, 206):
+            return None
+
+        filename = await check_response(response)
+        if response.status == 206:
+            # Read the single byte, so that the connection is kept alive
+            await response.read()
+
+        path = os.path.join(destination_folder, filename)
+        if is_complete(path, response.status, response.headers):
+            return path
+        return None
@@ -0,0 +1,122 @@
+import aiohttp
+
+from zonerama_api.aio.session import encode, resolve_session
+from zonerama_api.exceptions import (
+    InvalidZoneramaFolderPasswordException,
+    SecretIdNotSpecifiedException,
+    ZoneramaFolderLockedException,
+)
+from zonerama_api.folder import (
+    FOLDER_ALBUMS_URL,
+    FOLDER_UNLOCK_URL,
+    _parse_folder_locked,
+    _parse_folder_page,
+    _raise_for_folder_status,
+)
+from zonerama_api.html import DEFAULT_PARSER, Parser
+from zonerama_api.typing import AlbumId, FolderId, FolderPassword, SecretId
+
+
+async def folder_exists(
+    folder_id: FolderId,
+    session: aiohttp.ClientSession | None = None,
+) -> bool:
+    async with resolve_session(session).get(
+        FOLDER_ALBUMS_URL, params=encode({"tabId": folder_id}), allow_redirects=False
+    ) as response:
+        # non-existent or deleted
+        if response.status in (404, 500):
+            return False
+
+        response.raise_for_status()
+
+    return True
+
+
+async def is_folder_locked(
+    folder_id: FolderId,
+    secret_id: SecretId | None = None,
+    session: aiohttp.ClientSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> bool:
+    async with resolve_session(session).get(
+        FOLDER_ALBUMS_URL,
+        params=encode({"tabId": folder_id, "secret": secret_id}),
+        allow_redirects=False,
+    ) as response:
+        response.raise_for_status()
+
+        if response.status == 302:
+            raise SecretIdNotSpecifiedException()
+
+        html = await response.text()
+
+    return _parse_folder_locked(html, parser)
+
+
+async def unlock_folder(
+    folder_id: FolderId, password: FolderPassword, session: aiohttp.ClientSession
+) -> bool:
+    async with session.post(
+        FOLDER_UNLOCK_URL,
+        data=encode({"value": password}),
+        params=encode({"ID": folder_id}),
+    ) as response:
+        response.raise_for_status()
+
+        json = await response.json(content_type=None)
+
+    return json["Success"]
+
+
+async def get_folder_albums(
+    folder_id: FolderId,
+    secret_id: SecretId | None = None,
+    password: FolderPassword | None = None,
+    session: aiohttp.ClientSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> list[AlbumId]:
+    """An asynchronous version of zonerama_api.folder.get_folder_albums. \
+        See it for the description of the arguments.
+
+    Returns:
+        list[AlbumId]: A list of available album's IDs sorted \
+            as they would appear from top left to bottom right on the web.
+    """
+    session = resolve_session(session)
+
+    albums = await _fetch_folder_albums(folder_id, secret_id, session, parser)
+    if albums is None:
+        if password is None:
+            raise ZoneramaFolderLockedException(folder_id, secret_id)
+
+        if not await unlock_folder(folder_id, password, session):
+            raise InvalidZoneramaFolderPasswordException(folder_id, password)
+
+        # The page of an unlocked folder may still show the lock icon
+        albums = await _fetch_folder_albums(
+            folder_id, secret_id, session, parser, check_lock=False
+        )
+        assert albums is not None
+
+    return albums
+
+
+async def _fetch_folder_albums(
+    folder_id: FolderId,
+    secret_id: SecretId | None,
+    session: aiohttp.ClientSession,
+    parser: Parser = DEFAULT_PARSER,
+    check_lock: bool = True,
+) -> list[AlbumId] | None:
+    async with session.get(
+        FOLDER_ALBUMS_URL,
+        params=encode({"tabId": folder_id, "secret": secret_id}),
+        allow_redirects=False,
+    ) as response:
+        _raise_for_folder_status(folder_id, response.status)
+        response.raise_for_status()
+
+        html = await response.text()
+
+    return _parse_folder_page(html, parser, check_lock)
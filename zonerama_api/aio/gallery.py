@@ -0,0 +1,36 @@
+import aiohttp
+
+from zonerama_api.aio.session import resolve_session
+from zonerama_api.gallery import ZONERAMA_URL, _parse_public_folders
+from zonerama_api.html import DEFAULT_PARSER, Parser
+from zonerama_api.typing import FolderId, Username
+
+
+async def get_user_public_folders(
+    username: Username,
+    session: aiohttp.ClientSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> list[FolderId]:
+    """An asynchronous version of zonerama_api.gallery.get_user_public_folders.
+
+    Args:
+        username (Username): An existing Zonerama username with a gallery.
+        session (aiohttp.ClientSession | None, optional): \
+            The session to send the request with. \
+            Defaults to the session of the running event loop.
+        parser (Parser, optional): The HTML parser. Defaults to DEFAULT_PARSER.
+
+    Raises:
+        InvalidZoneramaUsernameException: \
+            The provided username is invalid.
+
+    Returns:
+        list[FolderId]: A list of public folders in the user's gallery \
+        sorted as they appear left-to-right on the webpage.
+    """
+    async with resolve_session(session).get(f"{ZONERAMA_URL}/{username}") as response:
+        response.raise_for_status()
+
+        html = await response.text()
+
+    return _parse_public_folders(username, html, parser)
@@ -0,0 +1,41 @@
+import os
+
+import aiohttp
+
+from zonerama_api.aio.download import download_resumable
+from zonerama_api.aio.session import resolve_session
+from zonerama_api.download import (
+    DEFAULT_CHUNK_SIZE,
+    PartialDownload,
+    partial_download_path,
+)
+from zonerama_api.photo import PHOTO_DOWNLOAD_URL, _parse_photo_filename
+from zonerama_api.typing import PhotoId
+
+
+async def download_photo(
+    photo_id: PhotoId,
+    destination_folder: str = os.getcwd(),
+    session: aiohttp.ClientSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    skip_existing: bool = False,
+) -> str:
+    partial = PartialDownload.load(
+        partial_download_path(destination_folder, f"photo-{photo_id}")
+    )
+    if not resume:
+        partial.reset()
+
+    async def check_response(response: aiohttp.ClientResponse) -> str:
+        return _parse_photo_filename(photo_id, response.headers)
+
+    return await download_resumable(
+        resolve_session(session),
+        f"{PHOTO_DOWNLOAD_URL}/{photo_id}",
+        partial,
+        destination_folder,
+        check_response,
+        chunk_size,
+        skip_existing,
+    )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Mapping
+
+import aiohttp
+
+from zonerama_api.metrics import RequestMetrics
+from zonerama_api.ratelimit import RateLimiter
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(sock_connect=10.0, sock_read=60.0)
+DEFAULT_LIMIT = 100  # open connections in total
+DEFAULT_LIMIT_PER_HOST = 32  # open connections per host
+
+_default_sessions: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, aiohttp.ClientSession
+] = weakref.WeakKeyDictionary()
+
+
+def create_session(
+    timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    limit: int = DEFAULT_LIMIT,
+    limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+    rate_limiter: RateLimiter | None = None,
+    metrics: RequestMetrics | None = None,
+) -> aiohttp.ClientSession:
+    """Creates an aiohttp session with a keep-alive connection pool \
+        shared by all coroutines using it. \
+        Requests over the limits wait for a free connection.
+
+    Args:
+        timeout (aiohttp.ClientTimeout, optional): The default timeouts. \
+            Defaults to DEFAULT_TIMEOUT.
+        limit (int, optional): The maximum number of open connections. \
+            Defaults to DEFAULT_LIMIT.
+        limit_per_host (int, optional): The maximum number of open connections \
+            per host. Defaults to DEFAULT_LIMIT_PER_HOST.
+        rate_limiter (RateLimiter | None, optional): The rate limiter \
+            to pace the requests with. May be shared with ZoneramaSessions \
+            used from other threads. Defaults to None.
+        metrics (RequestMetrics | None, optional): The metrics to record \
+            the requests in. Defaults to None.
+    """
+    trace_configs = []
+    if rate_limiter is not None:
+        trace_configs.append(_rate_limited(rate_limiter))
+    if metrics is not None:
+        trace_configs.append(_instrumented(metrics))
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host),
+        timeout=timeout,
+        trace_configs=trace_configs or None,
+    )
+
+
+def _rate_limited(rate_limiter: RateLimiter) -> aiohttp.TraceConfig:
+    async def on_request_start(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        await rate_limiter.acquire_async(params.url.host or "")
+
+    async def on_request_end(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        rate_limiter.feedback(
+            params.url.host or "",
+            params.response.status,
+            params.response.headers.get("retry-after"),
+        )
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+def _instrumented(metrics: RequestMetrics) -> aiohttp.TraceConfig:
+    async def on_request_start(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        context.start = metrics.start(params.method, str(params.url))
+        context.bytes_out = 0
+
+    async def on_request_chunk_sent(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        context.bytes_out += len(params.chunk)
+
+    async def on_request_end(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        # The body has not been read yet
+        bytes_in = int(params.response.headers.get("content-length", 0))
+        metrics.end(context.start, params.response.status, context.bytes_out, bytes_in)
+
+    async def on_request_exception(
+        session: aiohttp.ClientSession,
+        context: Any,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        metrics.end(context.start, None, context.bytes_out, error=params.exception)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def get_default_session() -> aiohttp.ClientSession:
+    """Returns the session of the running event loop \
+        used when no session is passed, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    session = _default_sessions.get(loop)
+    if session is None or session.closed:
+        session = _default_sessions[loop] = create_session()
+    return session
+
+
+def set_default_session(session: aiohttp.ClientSession | None) -> None:
+    """Replaces the session of the running event loop \
+        used when no session is passed. \
+        Passing None makes a fresh one be created on next use.
+    """
+    loop = asyncio.get_running_loop()
+    if session is None:
+        _default_sessions.pop(loop, None)
+    else:
+        _default_sessions[loop] = session
+
+
+async def close_default_session() -> None:
+    """Closes the session of the running event loop used when no session is passed. \
+        Should be awaited before the event loop is closed.
+    """
+    session = _default_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def resolve_session(session: aiohttp.ClientSession | None) -> aiohttp.ClientSession:
+    return get_default_session() if session is None else session
+
+
+def encode(params: Mapping[str, Any]) -> dict[str, str]:
+    """Encodes query or form parameters the same way requests does, \
+        which aiohttp refuses to do for anything but strings and numbers.
+    """
+    return {key: str(value) for key, value in params.items() if value is not None}
@@ -1,17 +1,28 @@
 import os
 import re
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from time import sleep
+from typing import Any, Iterator, Mapping
 
 import requests
-from bs4 import BeautifulSoup, Tag
 
+from zonerama_api.download import (
+    DEFAULT_CHUNK_SIZE,
+    PartialDownload,
+    download_resumable,
+    download_segmented,
+    partial_download_path,
+)
 from zonerama_api.exceptions import (
     InvalidZipIdException,
     SecretIdNotSpecifiedException,
     UnknownResponseException,
+    ZipNotReadyException,
 )
+from zonerama_api.html import DEFAULT_PARSER, Parser, parse_meta, read_head
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.profiling import DownloadProfiler, profile_phase
+from zonerama_api.session import ZoneramaSession, resolve_session
 from zonerama_api.typing import AlbumId, PhotoId, SecretId, ZipId
 
 ALBUM_PHOTO_LIST_URL = "https://zonerama.com/JSON/FlowLayout_PhotosInAlbum"
@@ -20,6 +31,7 @@ ZIP_READY_URL = "https://zonerama.com/Zip/IsReady"
 ZIP_DOWNLOAD_URL = "https://zonerama.com/Zip/Download"
 ZIP_SIZE_URL = "https://zonerama.com/Download/Size"
 ALBUM_BASE_URL = "https://zonerama.com/Link/Album"
+DEFAULT_PAGE_SIZE = 500
 
 
 @dataclass
@@ -37,11 +49,37 @@ class AlbumInfo:
     size: AlbumSize
 
 
-def get_album_info(album_id: AlbumId, secret_id: SecretId | None = None) -> AlbumInfo:
+def get_album_info(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
+) -> AlbumInfo:
+    """Fetches the name, the downloadable flag and the size of an album at once. \
+        The album page is fetched and parsed only once \
+        and the size is fetched concurrently with it.
+
+    Args:
+        album_id (AlbumId): The ID of the album.
+        secret_id (SecretId | None, optional): The secret id. \
+            Provide for secret albums. Defaults to None.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+
+    Returns:
+        AlbumInfo: The info of the album.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        size = executor.submit(get_album_size, album_id, True, True, secret_id, session)
+        meta = get_album_meta(album_id, secret_id, session)
+        return _album_info_from_meta(meta, size.result())
+
+
+def _album_info_from_meta(meta: dict[str, str], size: AlbumSize) -> AlbumInfo:
     return AlbumInfo(
-        name=get_album_name(album_id, secret_id),
-        downloadable=is_album_downloadable(album_id, secret_id),
-        size=get_album_size(album_id, True, True, secret_id),
+        name=_album_name_from_meta(meta),
+        downloadable=_album_downloadable_from_meta(meta),
+        size=size,
     )
 
 
@@ -50,24 +88,33 @@ def get_album_size(
     videos: bool = True,
     raws: bool = False,
     secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
 ) -> AlbumSize:
-    response = requests.post(
-        ZIP_SIZE_URL,
-        data={
-            "albumId": album_id,
-            "photoId": "",
-            "filter": "",
-            "secret": secret_id,
-            "download_Album": False,
-            "download_Videos": videos,
-            "download_RAWs": raws,
-        },
+    response = resolve_session(session).post(
+        ZIP_SIZE_URL, data=_album_size_data(album_id, videos, raws, secret_id)
     )
 
     if response.headers["content-type"] != "application/json; charset=utf-8":
         raise SecretIdNotSpecifiedException()
 
-    txt = response.json()["text"]
+    return _parse_album_size(response.json()["text"], videos)
+
+
+def _album_size_data(
+    album_id: AlbumId, videos: bool, raws: bool, secret_id: SecretId | None
+) -> dict[str, Any]:
+    return {
+        "albumId": album_id,
+        "photoId": "",
+        "filter": "",
+        "secret": secret_id,
+        "download_Album": False,
+        "download_Videos": videos,
+        "download_RAWs": raws,
+    }
+
+
+def _parse_album_size(txt: str, videos: bool) -> AlbumSize:
     mtch = re.match(
         r"Předpokládaná velikost archivu (?P<photo_count>\d+) fotek"
         r"(?: a (?P<video_count>\d+) videí)?"
@@ -99,51 +146,156 @@ def get_album_size(
 
 
 def get_album_meta(
-    album_id: AlbumId, secret_id: SecretId | None = None
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
 ) -> dict[str, str]:
-    response = requests.get(
+    # Only the <head> is read, the <meta> tags are all in it
+    with resolve_session(session).get(
         f"{ALBUM_BASE_URL}/{album_id}",
         params={"secret": secret_id},
         allow_redirects=False,
-    )
-    response.raise_for_status()
+        stream=True,
+    ) as response:
+        response.raise_for_status()
 
-    if response.status_code == 302:
-        raise SecretIdNotSpecifiedException()
+        if response.status_code == 302:
+            raise SecretIdNotSpecifiedException()
 
-    soup = BeautifulSoup(response.text, features="lxml")
-    meta = soup.find_all("meta")
+        html = read_head(response)
 
-    assert all(map(lambda x: isinstance(x, Tag), meta))
+    return _parse_album_meta(html, parser)
 
-    result: dict[str, str] = {}
-    for tag in meta:
-        key, value = tag["property"], tag["content"]
-        assert isinstance(key, str) and isinstance(value, str)
 
-        result[key] = value
+def _parse_album_meta(html: str, parser: Parser = DEFAULT_PARSER) -> dict[str, str]:
+    return parse_meta(html, parser)
 
-    return result
 
+def get_album_name(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
+) -> str:
+    return _album_name_from_meta(get_album_meta(album_id, secret_id, session))
+
+
+def _album_name_from_meta(meta: dict[str, str]) -> str:
+    return meta["og:title"]
 
-def get_album_name(album_id: AlbumId, secret_id: SecretId | None = None) -> str:
-    return get_album_meta(album_id, secret_id)["og:title"]
+
+def is_album_downloadable(
+    album_id: AlbumId,
+    secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
+) -> bool:
+    return _album_downloadable_from_meta(get_album_meta(album_id, secret_id, session))
 
 
-def is_album_downloadable(album_id: AlbumId, secret_id: SecretId | None = None) -> bool:
-    return get_album_meta(album_id, secret_id)["znrm:downloadable"] == "true"
+def _album_downloadable_from_meta(meta: dict[str, str]) -> bool:
+    return meta["znrm:downloadable"] == "true"
 
 
-def get_album_photos(album_id: AlbumId) -> list[PhotoId]:
-    response = requests.post(
+def get_album_photos(
+    album_id: AlbumId, session: ZoneramaSession | None = None
+) -> list[PhotoId]:
+    response = resolve_session(session).post(
         ALBUM_PHOTO_LIST_URL,
         data={"albumId": album_id, "startIndex": 0, "count": 999_999_999},
     )
-    return [
-        PhotoId(elem["photoId"])
-        for elem in response.json()["items"]
-        if "photoId" in elem
-    ]
+    return _parse_album_photos(response.json())
+
+
+def _parse_album_photos(json: dict[str, Any]) -> list[PhotoId]:
+    return [PhotoId(elem["photoId"]) for elem in json["items"] if "photoId" in elem]
+
+
+def iter_album_items(
+    album_id: AlbumId,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    session: ZoneramaSession | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yields the item records of an album as they appear on the web, \
+        fetching them page by page.
+
+    Args:
+        album_id (AlbumId): The ID of the album.
+        page_size (int, optional): The number of items fetched per request. \
+            Defaults to DEFAULT_PAGE_SIZE.
+        prefetch (bool, optional): Whether to fetch the next page \
+            while the current one is being consumed. Defaults to True.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+
+    Yields:
+        dict[str, Any]: The item records. Photos and videos have a photoId.
+    """
+    session = resolve_session(session)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = executor.submit(_fetch_album_items, album_id, 0, page_size, session)
+        start_index = 0
+        while True:
+            items = page.result()
+            start_index += len(items)
+            last = len(items) < page_size
+
+            if not last and prefetch:
+                page = executor.submit(
+                    _fetch_album_items, album_id, start_index, page_size, session
+                )
+
+            yield from items
+
+            if last:
+                return
+
+            if not prefetch:
+                page = executor.submit(
+                    _fetch_album_items, album_id, start_index, page_size, session
+                )
+
+
+def iter_album_photos(
+    album_id: AlbumId,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    session: ZoneramaSession | None = None,
+) -> Iterator[PhotoId]:
+    """Yields the IDs of photos in an album as they appear on the web, \
+        fetching them page by page. Unlike get_album_photos, \
+        the first IDs are available before the whole album is listed.
+
+    Args:
+        album_id (AlbumId): The ID of the album.
+        page_size (int, optional): The number of items fetched per request. \
+            Defaults to DEFAULT_PAGE_SIZE.
+        prefetch (bool, optional): Whether to fetch the next page \
+            while the current one is being consumed. Defaults to True.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+
+    Yields:
+        PhotoId: The IDs of the photos.
+    """
+    for item in iter_album_items(album_id, page_size, prefetch, session):
+        if "photoId" in item:
+            yield PhotoId(item["photoId"])
+
+
+def _fetch_album_items(
+    album_id: AlbumId, start_index: int, count: int, session: ZoneramaSession
+) -> list[dict[str, Any]]:
+    response = session.post(
+        ALBUM_PHOTO_LIST_URL,
+        data={"albumId": album_id, "startIndex": start_index, "count": count},
+    )
+    response.raise_for_status()
+
+    return response.json()["items"]
 
 
 def _get_zip_id(
@@ -153,6 +305,7 @@ def _get_zip_id(
     original: bool = False,
     av1: bool = False,
     raw: bool = False,
+    session: ZoneramaSession | None = None,
 ) -> ZipId:
     """Send a request to generate a ZIP file \
         and return the ID of the ZIP file for given album.
@@ -167,20 +320,16 @@ def _get_zip_id(
         original (bool): unknown, defaults to False
         av1 (bool): Whether the av1 codec should be preferred when available. Defaults to False.
         raw (bool): Whether raw files should be included when available. Defaults to False.
+        session (ZoneramaSession | None): The session to send the request with. \
+            Defaults to the module-level session.
 
     Returns:
         ZipId: The ID of the requested ZIP file to be used in downloadZip.
     """
 
-    response = requests.get(
+    response = resolve_session(session).get(
         f"{ZIP_REQUEST_URL}/{album_id}",
-        {
-            "secret": secret_id,
-            "includeVideos": include_videos,
-            "original": original,
-            "av1": av1,
-            "raw": raw,
-        },
+        _zip_request_params(secret_id, include_videos, original, av1, raw),
     )
     response.raise_for_status()
 
@@ -193,15 +342,33 @@ def _get_zip_id(
     return json["Id"]
 
 
-def _is_zip_ready(zip_id: ZipId) -> bool:
-    response = requests.get(f"{ZIP_READY_URL}/{zip_id}")
+def _zip_request_params(
+    secret_id: SecretId | None,
+    include_videos: bool,
+    original: bool,
+    av1: bool,
+    raw: bool,
+) -> dict[str, Any]:
+    return {
+        "secret": secret_id,
+        "includeVideos": include_videos,
+        "original": original,
+        "av1": av1,
+        "raw": raw,
+    }
+
+
+def _is_zip_ready(zip_id: ZipId, session: ZoneramaSession | None = None) -> bool:
+    response = resolve_session(session).get(f"{ZIP_READY_URL}/{zip_id}")
     response.raise_for_status()
 
     if response.headers["content-type"] != "application/json; charset=utf-8":
         raise InvalidZipIdException(zip_id)
 
-    json = response.json()
+    return _parse_zip_ready(zip_id, response.json())
+
 
+def _parse_zip_ready(zip_id: ZipId, json: dict[str, Any]) -> bool:
     if json["Error"] is not None:
         raise InvalidZipIdException(zip_id, json["Error"])
 
@@ -209,8 +376,15 @@ def _is_zip_ready(zip_id: ZipId) -> bool:
 
 
 def _download_zip(
-    zip_id: ZipId, destination_folder: str, sleep_for: float = 5.0
-) -> None:
+    zip_id: ZipId,
+    destination_folder: str,
+    sleep_for: float = 5.0,
+    session: ZoneramaSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    partial: PartialDownload | None = None,
+    segments: int = 1,
+    profiler: DownloadProfiler | None = None,
+) -> str:
     """Download the generated ZIP file with the provided ID. \
         Note: Downloads an empty archive \
             if downloads are prohibited by the album's author.
@@ -221,32 +395,145 @@ def _download_zip(
         sleep_for (float, optional): \
             The time for which the function sleeps \
             while the file is not ready, in seconds. Defaults to 5.0.
+        session (ZoneramaSession | None, optional): \
+            The session to send the request with. \
+            Defaults to the module-level session.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream the file to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        partial (PartialDownload | None, optional): \
+            The state of an interrupted download of the ZIP file to resume. \
+            Defaults to the one kept for zip_id in destination_folder.
+        segments (int, optional): The number of connections \
+            the ZIP file is downloaded over in parallel, \
+            each fetching its own byte range. Defaults to 1.
+        profiler (DownloadProfiler | None, optional): \
+            Times the transfer and the disk writes. Defaults to None.
 
     Raises:
         InvalidZipIdException: The provided zip_id is invalid.
         UnknownResponseException: The server provided an unkown response.
+        IncompleteDownloadException: The connection was closed \
+            before the whole file was received. Calling again resumes it.
+
+    Returns:
+        str: The path of the downloaded ZIP file.
     """
-    response = requests.get(f"{ZIP_DOWNLOAD_URL}/{zip_id}")
-    response.raise_for_status()
+    if partial is None:
+        partial = PartialDownload.load(
+            partial_download_path(destination_folder, f"zip-{zip_id}")
+        )
+
+    def check_response(response: requests.Response) -> str:
+        if response.headers["content-type"] == "text/html; charset=utf-8":
+            _raise_for_zip_error(zip_id, response.text)
+
+        return _parse_zip_filename(response.headers)
+
+    if segments > 1:
+        return download_segmented(
+            resolve_session(session),
+            f"{ZIP_DOWNLOAD_URL}/{zip_id}",
+            partial,
+            destination_folder,
+            check_response,
+            segments,
+            chunk_size,
+            profiler=profiler,
+        )
+
+    return download_resumable(
+        resolve_session(session),
+        f"{ZIP_DOWNLOAD_URL}/{zip_id}",
+        partial,
+        destination_folder,
+        check_response,
+        chunk_size,
+        profiler=profiler,
+    )
 
-    if response.headers["content-type"] == "text/html; charset=utf-8":
-        match response.text:
-            case "ZipID is invalid":
-                raise InvalidZipIdException(zip_id)
-            # add Zip is not ready
 
-            case _:
-                raise UnknownResponseException(response.text)
+def _raise_for_zip_error(zip_id: ZipId, text: str) -> None:
+    match text:
+        case "ZipID is invalid":
+            raise InvalidZipIdException(zip_id)
+        # add Zip is not ready
+
+        case _:
+            raise UnknownResponseException(text)
 
-    assert response.headers["content-type"] == "application/zip"
 
-    content_disposition = response.headers["content-disposition"]
+def _parse_zip_filename(headers: Mapping[str, str]) -> str:
+    assert headers["content-type"] == "application/zip"
+
+    content_disposition = headers["content-disposition"]
     mtch = re.match(r'attachment; filename="([^"]+)"', content_disposition)
     assert mtch is not None
-    filename = mtch.group(1)
+    return mtch.group(1)
+
+
+def _album_download_source(
+    album_id: AlbumId, include_videos: bool, original: bool, av1: bool, raw: bool
+) -> dict[str, Any]:
+    # The secret id is left out, so that it is not written to disk
+    return {
+        "album_id": album_id,
+        "include_videos": include_videos,
+        "original": original,
+        "av1": av1,
+        "raw": raw,
+    }
+
+
+def _zip_polling(
+    polling: PollingStrategy | None, sleep_for: float | None
+) -> PollingStrategy:
+    if polling is not None:
+        return polling
+    if sleep_for is not None:
+        return PollingStrategy.fixed(sleep_for)
+    return PollingStrategy()
 
-    with open(os.path.join(destination_folder, filename), "wb") as df:
-        df.write(response.content)
+
+def _prepare_album_zip(
+    album_id: AlbumId,
+    secret_id: SecretId | None,
+    include_videos: bool,
+    original: bool,
+    av1: bool,
+    raw: bool,
+    destination_folder: str,
+    session: ZoneramaSession | None,
+    resume: bool,
+) -> tuple[PartialDownload, ZipId, bool]:
+    """Requests the ZIP file of an album, \
+        unless one from an interrupted download is still known to the server.
+
+    Returns:
+        tuple[PartialDownload, ZipId, bool]: The state of the download, \
+            the ID of the ZIP file and whether it is known to be ready.
+    """
+    source = _album_download_source(album_id, include_videos, original, av1, raw)
+    partial = PartialDownload.load(
+        partial_download_path(destination_folder, f"album-{album_id}")
+    )
+    if not resume or partial.source != source:
+        partial.reset(source)
+
+    zip_id = partial.zip_id
+    if zip_id is not None:
+        try:
+            return partial, zip_id, _is_zip_ready(zip_id, session)
+        except InvalidZipIdException:
+            # The ZIP file has expired on the server
+            partial.reset(source)
+
+    zip_id = _get_zip_id(
+        album_id, secret_id, include_videos, original, av1, raw, session
+    )
+    partial.zip_id = zip_id
+    partial.save()
+    return partial, zip_id, False
 
 
 def download_album(
@@ -257,11 +544,19 @@ def download_album(
     av1: bool = False,
     raw: bool = False,
     destination_folder: str = os.getcwd(),
-    sleep_for: float = 5.0,
-) -> None:
+    sleep_for: float | None = None,
+    session: ZoneramaSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    segments: int = 1,
+    polling: PollingStrategy | None = None,
+    profiler: DownloadProfiler | None = None,
+) -> str:
     """Downloads the Zonerama album with the provided ID as a ZIP file. \
         If the album is a secret one, secret_id must be specified. \
-        If the author has prohibited downloads, downloads an empty archive.
+        If the author has prohibited downloads, downloads an empty archive. \
+        An interrupted download is resumed by calling the function again \
+        with the same arguments, reusing the already generated ZIP file.
 
     Args:
         album_id (AlbumId): The ID of the album you wish to download. \
@@ -277,13 +572,68 @@ def download_album(
         raw (bool): Whether raw files should be included when available. Defaults to False.
         destination_folder (str, optional): \
             The destination folder for the ZIP file. Defaults to os.getcwd().
-        sleep_for (float, optional): The time for which the function sleeps \
-            while the file is not ready, in seconds. Defaults to 5.0.
-    """
-    zip_id = _get_zip_id(album_id, secret_id, include_videos, original, av1, raw)
+        sleep_for (float | None, optional): The time for which the function sleeps \
+            while the file is not ready, in seconds. \
+            Shorthand for a fixed polling strategy. Defaults to None.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream the ZIP file to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        resume (bool, optional): Whether to resume an interrupted download \
+            of the album. Defaults to True.
+        segments (int, optional): The number of connections \
+            the ZIP file is downloaded over in parallel. \
+            Segmented downloads reuse the generated ZIP file when resumed, \
+            but not its downloaded bytes. Defaults to 1.
+        polling (PollingStrategy | None, optional): \
+            How often to check whether the ZIP file is ready. \
+            Unless it sets an initial interval, the interval is scaled \
+            to the estimated size of the ZIP file. \
+            Defaults to an exponential backoff giving up after DEFAULT_DEADLINE.
+        profiler (DownloadProfiler | None, optional): \
+            Adds up the time spent in each phase of the download. \
+            Defaults to None.
 
-    while not _is_zip_ready(zip_id):
-        print(f"Waiting on zip_id: {zip_id}, {sleep_for}s", file=sys.stderr)
-        sleep(sleep_for)
+    Raises:
+        ZipNotReadyException: The ZIP file was not ready before the deadline \
+            of the polling strategy. Calling again keeps waiting for it.
 
-    _download_zip(zip_id, destination_folder, sleep_for)
+    Returns:
+        str: The path of the downloaded ZIP file.
+    """
+    with profile_phase(profiler, "zip request"):
+        partial, zip_id, ready = _prepare_album_zip(
+            album_id,
+            secret_id,
+            include_videos,
+            original,
+            av1,
+            raw,
+            destination_folder,
+            session,
+            resume,
+        )
+
+    if not ready:
+        polling = _zip_polling(polling, sleep_for)
+        if polling.initial is None:
+            with profile_phase(profiler, "metadata"):
+                size = get_album_size(album_id, include_videos, raw, secret_id, session)
+            polling = polling.scaled_to(size.zip_size)
+
+        with profile_phase(profiler, "readiness wait"):
+            if not polling.wait(lambda: _is_zip_ready(zip_id, session)):
+                raise ZipNotReadyException(zip_id)
+
+    return _download_zip(
+        zip_id,
+        destination_folder,
+        sleep_for,
+        session,
+        chunk_size,
+        partial,
+        segments,
+        profiler,
+    )
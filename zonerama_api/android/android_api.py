@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha256
 
 import zeep
 from requests import Session
+from requests.adapters import HTTPAdapter
 from zeep import Transport
+from zeep.cache import Base, SqliteCache
 
 import zonerama_api.android.android_exceptions as zaexc
 from zonerama_api.android.android_typing import (
     AccountID,
     AccountInfo,
+    AccountTree,
     ApiResponse,
     TabInfo,
     TabID,
@@ -19,29 +24,72 @@ from zonerama_api.android.android_typing import (
 
 WSDL_API = "http://zonerama.com/services/android/apiservice.asmx?WSDL"
 WSDL_DATA = "http://zonerama.com/services/android/dataservice.asmx?WSDL"
+WSDL_CACHE_TIMEOUT = 7 * 24 * 3600  # seconds, the WSDLs rarely change
+DEFAULT_TREE_WORKERS = 8
+DEFAULT_POOL_MAXSIZE = 16  # keep-alive connections kept per host
 
 ### DOCUMENTATION: http://zonerama.com/services/android/dataservice.asmx
 ###                http://zonerama.com/services/android/apiservice.asmx
 
 
 class Client:
+    """A client of the SOAP services used by the Zonerama Android app. \
+        The client of each service is built on first use, \
+        from a WSDL cached on disk for WSDL_CACHE_TIMEOUT seconds, \
+        so constructing one sends no requests. \
+        A client may be shared by threads once logged in.
+    """
+
     _session: Session
     _transport: Transport
-    _client_api: zeep.Client
-    _client_data: zeep.Client
+    _clients: dict[str, zeep.Client]  # by WSDL URL
+    _clients_lock: threading.Lock
     email: str
     password: str
     logged_in: bool = False
     logged_in_as: AccountID | None = None
 
-    def __init__(self, email: str, password: str) -> None:
+    def __init__(
+        self, email: str, password: str, wsdl_cache: Base | None = None
+    ) -> None:
+        """
+        Args:
+            email (str): The email to log in with.
+            password (str): The password to log in with.
+            wsdl_cache (Base | None, optional): The zeep cache \
+                to keep the WSDLs in. Defaults to a SqliteCache \
+                in the user cache folder.
+        """
+        if wsdl_cache is None:
+            wsdl_cache = SqliteCache(timeout=WSDL_CACHE_TIMEOUT)
+
         self._session = Session()
-        self._transport = Transport(session=self._session)
-        self._client_api = zeep.Client(wsdl=WSDL_API, transport=self._transport)
-        self._client_data = zeep.Client(wsdl=WSDL_DATA, transport=self._transport)
+        # Keep a connection per thread fetching concurrently
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOL_MAXSIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._transport = Transport(cache=wsdl_cache, session=self._session)
+        self._clients = {}
+        self._clients_lock = threading.Lock()
         self.email = email
         self.password = password
 
+    def _client(self, wsdl: str) -> zeep.Client:
+        with self._clients_lock:
+            client = self._clients.get(wsdl)
+            if client is None:
+                client = zeep.Client(wsdl=wsdl, transport=self._transport)
+                self._clients[wsdl] = client
+            return client
+
+    @property
+    def _client_api(self) -> zeep.Client:
+        return self._client(WSDL_API)
+
+    @property
+    def _client_data(self) -> zeep.Client:
+        return self._client(WSDL_DATA)
+
     def __enter__(self) -> Client:
         self.login()
         return self
@@ -214,3 +262,33 @@ class Client:
             return []
 
         return [AlbumInfo(album) for album in response.result.Album]
+
+    def get_account_tree(
+        self, id: AccountID, workers: int = DEFAULT_TREE_WORKERS
+    ) -> AccountTree:
+        """Get the tabs of the account with the given ID and the albums in each. \
+            The albums of the tabs are fetched concurrently over the shared session. \
+            Private tabs will be listed only when id is of the account logged in.
+
+        Args:
+            id (AccountID): The ID of the account
+            workers (int, optional): The maximum number of tabs \
+                whose albums are fetched at once. Defaults to DEFAULT_TREE_WORKERS.
+
+        Raises:
+             zaexc.ZoneramaAndroidNotLoggedInException: Not logged in
+             zaexc.ZoneramaAndroidUnknownAccountID: Unknown account id
+             zaexc.ZoneramaAndroidAccessDenied: Access denied
+
+        Returns:
+            AccountTree: The tabs of the account linked to their albums.
+        """
+        tabs = self.get_tabs(id)
+        if not tabs:
+            return AccountTree(id, [], {})
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(tabs))) as executor:
+            albums = executor.map(self.get_albums_in_tab, [tab.id for tab in tabs])
+            return AccountTree(
+                id, tabs, {tab.id: tab_albums for tab, tab_albums in zip(tabs, albums)}
+            )
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, TypeAlias
 
@@ -5,18 +6,33 @@ import zonerama_api.android.android_exceptions as zaexc
 
 
 def map_attributes(mapping: dict[str, str]):
+    """Turns the decorated class into one with __slots__ \
+        and a constructor copying the attributes of a zeep object, \
+        mapping maps the attribute names of the class to those of the object. \
+        The constructor is generated once per class as straight-line code, \
+        so constructing an instance neither loops over mapping nor builds a __dict__.
+    """
+
     def decorator(cls: Any):
-        original_init = cls.__init__
+        assert all(
+            name.isidentifier() and key.isidentifier() for name, key in mapping.items()
+        )
 
-        def init_wrapper(
-            self: Any, obj: Any, *args: tuple[Any], **kwargs: dict[str, Any]
-        ):
-            for class_attr, obj_key in mapping.items():
-                setattr(self, class_attr, getattr(obj, obj_key))
-            original_init(self, *args, **kwargs)
+        lines = [f"    self.{name} = obj.{key}" for name, key in mapping.items()]
+        namespace: dict[str, Any] = {}
+        exec("def __init__(self, obj):\n" + "\n".join(lines or ["    pass"]), namespace)
+        init = namespace["__init__"]
+        init.__qualname__ = f"{cls.__qualname__}.__init__"
 
-        cls.__init__ = init_wrapper
-        return cls
+        body = {
+            name: value
+            for name, value in vars(cls).items()
+            if name not in ("__dict__", "__weakref__")
+        }
+        body["__slots__"] = tuple(mapping)
+        body["__init__"] = init
+        body["_attribute_map"] = dict(mapping)
+        return type(cls)(cls.__name__, cls.__bases__, body)
 
     return decorator
 
@@ -236,3 +252,13 @@ class AlbumInfo:
     comments: int
     browse: int
     like: int
+
+
+@dataclass
+class AccountTree:
+    account_id: AccountID
+    tabs: list[TabInfo]
+    albums: dict[TabID, list[AlbumInfo]]  # by the ID of their tab
+
+    def albums_in(self, tab: TabInfo) -> list[AlbumInfo]:
+        return self.albums[tab.id]
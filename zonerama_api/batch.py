@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from time import monotonic, sleep
+from typing import Callable, Iterable
+
+import requests
+
+from zonerama_api.album import _download_zip, _is_zip_ready, _prepare_album_zip
+from zonerama_api.download import DEFAULT_CHUNK_SIZE, PartialDownload
+from zonerama_api.exceptions import ZipNotReadyException, ZoneramaDownloaderException
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.session import ZoneramaSession, resolve_session
+from zonerama_api.typing import AlbumId, SecretId, ZipId
+
+DEFAULT_LOOKAHEAD = 4
+DEFAULT_DOWNLOAD_WORKERS = 2
+
+# Failures of a single album, which do not stop the others
+AlbumException = (ZoneramaDownloaderException, requests.RequestException, OSError)
+
+
+@dataclass
+class AlbumDownload:
+    album_id: AlbumId
+    secret_id: SecretId | None = None
+
+
+@dataclass
+class BatchResult:
+    paths: dict[AlbumId, str] = field(default_factory=dict)
+    errors: dict[AlbumId, Exception] = field(default_factory=dict)
+
+
+@dataclass
+class _PendingZip:
+    album: AlbumDownload
+    zip_id: ZipId
+    partial: PartialDownload
+    requested: float  # monotonic time the ZIP file was requested at
+
+
+def download_albums(
+    albums: Iterable[AlbumId | AlbumDownload],
+    destination_folder: str = os.getcwd(),
+    include_videos: bool = True,
+    original: bool = False,
+    av1: bool = False,
+    raw: bool = False,
+    lookahead: int = DEFAULT_LOOKAHEAD,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    polling: PollingStrategy | None = None,
+    session: ZoneramaSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    segments: int = 1,
+    on_complete: Callable[[AlbumId, str | Exception], None] | None = None,
+) -> BatchResult:
+    """Downloads many albums as ZIP files, overlapping the generation \
+        of ZIP files on the server with the downloads of finished ones. \
+        The ZIP files of up to lookahead albums are requested ahead, \
+        all of them are polled in one loop and whichever becomes ready first \
+        is downloaded by one of download_workers threads. \
+        A failure of one album does not stop the others.
+
+    Args:
+        albums (Iterable[AlbumId | AlbumDownload]): The albums to download. \
+            Pass AlbumDownload for secret albums.
+        destination_folder (str, optional): \
+            The destination folder for the ZIP files. Defaults to os.getcwd().
+        include_videos (bool, optional): Whether videos are included \
+            or just their thumbnails. Defaults to True.
+        original (bool, optional): Unknown. Defaults to False.
+        av1 (bool, optional): Whether the av1 codec should be preferred when available. Defaults to False.
+        raw (bool, optional): Whether raw files should be included when available. Defaults to False.
+        lookahead (int, optional): The maximum number of ZIP files \
+            requested but not yet being downloaded. Defaults to DEFAULT_LOOKAHEAD.
+        download_workers (int, optional): The maximum number of ZIP files \
+            downloaded at once. Defaults to DEFAULT_DOWNLOAD_WORKERS.
+        polling (PollingStrategy | None, optional): How often to poll \
+            while nothing has changed. Its deadline applies to each ZIP file. \
+            Defaults to an exponential backoff giving up after DEFAULT_DEADLINE.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream the ZIP files to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        resume (bool, optional): Whether to resume interrupted downloads. \
+            Defaults to True.
+        segments (int, optional): The number of connections \
+            each ZIP file is downloaded over in parallel. Defaults to 1.
+        on_complete (Callable[[AlbumId, str | Exception], None] | None, optional): \
+            Called with the path or the exception as each album finishes. \
+            Defaults to None.
+
+    Returns:
+        BatchResult: The paths of the downloaded ZIP files \
+            and the exceptions of the failed albums, by album ID.
+    """
+    session = resolve_session(session)
+    polling = PollingStrategy() if polling is None else polling
+    result = BatchResult()
+
+    pending = deque(
+        album if isinstance(album, AlbumDownload) else AlbumDownload(album)
+        for album in albums
+    )
+    generating: list[_PendingZip] = []
+    ready: deque[_PendingZip] = deque()
+    downloading: dict[Future[str], AlbumId] = {}
+
+    def complete(album_id: AlbumId, outcome: str | Exception) -> None:
+        if isinstance(outcome, Exception):
+            result.errors[album_id] = outcome
+        else:
+            result.paths[album_id] = outcome
+        if on_complete is not None:
+            on_complete(album_id, outcome)
+
+    intervals = polling.intervals()
+    with ThreadPoolExecutor(max_workers=download_workers) as executor:
+        while pending or generating or ready or downloading:
+            progressed = False
+
+            while pending and len(generating) + len(ready) < lookahead:
+                album = pending.popleft()
+                try:
+                    partial, zip_id, is_ready = _prepare_album_zip(
+                        album.album_id,
+                        album.secret_id,
+                        include_videos,
+                        original,
+                        av1,
+                        raw,
+                        destination_folder,
+                        session,
+                        resume,
+                    )
+                except AlbumException as e:
+                    complete(album.album_id, e)
+                    continue
+
+                pending_zip = _PendingZip(album, zip_id, partial, monotonic())
+                (ready if is_ready else generating).append(pending_zip)
+
+            for pending_zip in list(generating):
+                try:
+                    is_ready = _is_zip_ready(pending_zip.zip_id, session)
+                    if not is_ready and polling.deadline is not None:
+                        if monotonic() - pending_zip.requested > polling.deadline:
+                            raise ZipNotReadyException(pending_zip.zip_id)
+                except AlbumException as e:
+                    generating.remove(pending_zip)
+                    complete(pending_zip.album.album_id, e)
+                    continue
+
+                if is_ready:
+                    generating.remove(pending_zip)
+                    ready.append(pending_zip)
+                    progressed = True
+
+            while ready and len(downloading) < download_workers:
+                pending_zip = ready.popleft()
+                future = executor.submit(
+                    _download_zip,
+                    pending_zip.zip_id,
+                    destination_folder,
+                    session=session,
+                    chunk_size=chunk_size,
+                    partial=pending_zip.partial,
+                    segments=segments,
+                )
+                downloading[future] = pending_zip.album.album_id
+
+            for future in [future for future in downloading if future.done()]:
+                album_id = downloading.pop(future)
+                try:
+                    complete(album_id, future.result())
+                except AlbumException as e:
+                    complete(album_id, e)
+                progressed = True
+
+            if progressed or not (generating or downloading):
+                intervals = polling.intervals()
+                continue
+
+            interval = next(intervals)
+            if downloading:
+                wait(downloading, timeout=interval, return_when=FIRST_COMPLETED)
+            else:
+                sleep(interval)
+
+    return result
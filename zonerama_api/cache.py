@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from time import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from zonerama_api.retry import RetryingAdapter
+
+HOUR = 60 * 60  # in seconds
+DAY = 24 * HOUR
+DEFAULT_MAX_SIZE = 64 * 1024**2  # in bytes
+
+# How long the responses of the metadata endpoints are served without asking
+# the server, in seconds, by the path of their URL. Endpoints not listed here
+# are never cached.
+DEFAULT_TTLS: list[tuple[str, float]] = [
+    (r"^/Link/Album/", DAY),
+    (r"^/Part/AlbumsInTab", HOUR),
+    (r"^/Part/PhotoOnSlide", 7 * DAY),
+    (r"^/Profile/", 7 * DAY),
+    (r"^/[^/]+$", HOUR),  # profile pages
+]
+
+# The pages of locked folders differ once their password cookies are set,
+# the other cached pages do not depend on the cookies of the session
+COOKIE_DEPENDENT_PATHS = re.compile(r"^/Part/AlbumsInTab")
+
+# Describe the stored body as received, not as it is stored
+_DROPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "set-cookie",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    expires: float  # seconds since the epoch
+
+    @property
+    def fresh(self) -> bool:
+        return time() < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """The conditional request headers revalidating the response."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+class ResponseCache:
+    """A persistent cache of the responses of the metadata endpoints. \
+        Responses are served from disk until their TTL expires, \
+        then revalidated with If-None-Match and If-Modified-Since, \
+        so unchanged pages come back as a bodyless 304. \
+        The least recently used responses are evicted \
+        once the bodies exceed max_size bytes.
+    """
+
+    max_size: int
+    _ttls: list[tuple[re.Pattern[str], float]]
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        path: str,
+        ttls: list[tuple[str, float]] = DEFAULT_TTLS,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        """
+        Args:
+            path (str): The path of the SQLite database.
+            ttls (list[tuple[str, float]], optional): Pairs of a regular \
+                expression matching URL paths and the number of seconds \
+                their responses are served without revalidation. \
+                The first matching one applies, URLs matching none \
+                are not cached. Defaults to DEFAULT_TTLS.
+            max_size (int, optional): The maximum total size \
+                of the cached bodies, in bytes. Defaults to DEFAULT_MAX_SIZE.
+        """
+        self.max_size = max_size
+        self._ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self._lock = threading.Lock()
+
+        # Shared by the threads of the session, guarded by _lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def ttl(self, url: str) -> float | None:
+        """The TTL of the responses of url, None if they are not cached."""
+        path = urlsplit(url).path
+        for pattern, ttl in self._ttls:
+            if pattern.search(path):
+                return ttl
+        return None
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT status, headers, body, expires FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time(), key)
+            )
+
+        status, headers, body, expires = row
+        return CachedResponse(status, json.loads(headers), body, expires)
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        size = len(response.body)
+        if size > self.max_size:
+            return
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status,
+                    json.dumps(response.headers),
+                    response.body,
+                    size,
+                    response.expires,
+                    time(),
+                ),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+
+def cache_key(request: requests.PreparedRequest) -> str:
+    """Identifies a request by its method, URL and body. \
+        The cookies are only part of the key of the folder pages, \
+        as unlocking a folder changes the page returned. \
+        Session and tracking cookies changing from response to response \
+        would otherwise make every other page miss the cache.
+    """
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+
+    url = request.url or ""
+    cookies = ""
+    if COOKIE_DEPENDENT_PATHS.search(urlsplit(url).path):
+        cookies = request.headers.get("Cookie", "")
+
+    digest = hashlib.sha256()
+    for part in (
+        (request.method or "").encode(),
+        url.encode(),
+        body,
+        cookies.encode(),
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CachingAdapter(RetryingAdapter):
+    """An HTTPAdapter answering GET requests from a ResponseCache \
+        when possible. Only successful responses are stored. \
+        Requests answered from the cache do not count towards the rate limit \
+        and are never retried.
+    """
+
+    cache: ResponseCache
+
+    def __init__(self, cache: ResponseCache, *args, **kwargs) -> None:
+        self.cache = cache
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        ttl = None if request.method != "GET" else self.cache.ttl(request.url)
+        if ttl is None:
+            return super().send(request, *args, **kwargs)
+
+        key = cache_key(request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if cached.fresh:
+                return self._build_cached_response(request, cached, True)
+
+            for header, value in cached.validators.items():
+                request.headers.setdefault(header, value)
+
+        response = super().send(request, *args, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            # A 304 may carry updated validators
+            for header in ("etag", "last-modified"):
+                if header in response.headers:
+                    cached.headers[header] = response.headers[header]
+            cached.expires = time() + ttl
+            self.cache.put(key, cached)
+            return self._build_cached_response(request, cached, False)
+
+        if response.status_code == 200:
+            headers = {
+                name.lower(): value
+                for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            }
+            self.cache.put(
+                key, CachedResponse(200, headers, response.content, time() + ttl)
+            )
+
+        return response
+
+    def _build_cached_response(
+        self,
+        request: requests.PreparedRequest,
+        cached: CachedResponse,
+        from_cache: bool,
+    ) -> requests.Response:
+        """Builds the response to request from cached, \
+            marked with whether it was answered without sending request.
+        """
+        response = requests.Response()
+        response.status_code = cached.status
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url or ""
+        response.request = request
+        response.raw = io.BytesIO(cached.body)
+        response._content = cached.body
+        response._content_consumed = True
+        response.connection = self
+        response.from_cache = from_cache
+        return response
@@ -5,62 +5,143 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from zonerama_api.classes.zonerama_folder import ZoneramaFolder
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
+from typing import Iterable, Iterator
 
 from zonerama_api.album import (
+    DEFAULT_PAGE_SIZE,
     AlbumInfo,
+    AlbumSize,
+    _album_downloadable_from_meta,
+    _album_name_from_meta,
     download_album,
     get_album_info,
+    get_album_meta,
     get_album_photos,
+    get_album_size,
+    iter_album_photos,
 )
 from zonerama_api.classes.zonerama_photo import ZoneramaPhoto
+from zonerama_api.download import DEFAULT_CHUNK_SIZE
+from zonerama_api.photo import DEFAULT_WORKERS, download_photos
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.profiling import DownloadProfiler
+from zonerama_api.session import ZoneramaSession
 from zonerama_api.typing import AlbumId, SecretId
 
+DEFAULT_PREFETCH_WORKERS = 8
+
 
 class ZoneramaAlbum:
-    """A class representing an album in the Zonerama Web Gallery."""
+    """A class representing an album in the Zonerama Web Gallery. \
+        Constructing one is free, the info of the album is fetched \
+        on first access. The name and the downloadable flag come from \
+        one request and the size from another, each made only when needed.
+    """
 
     id: AlbumId
     folder: ZoneramaFolder | None
     secret_id: SecretId | None
-    info: AlbumInfo
+    session: ZoneramaSession | None
+    _name: str | None
+    _downloadable: bool | None
+    _size: AlbumSize | None
 
     def __init__(
         self,
         id: AlbumId,
         folder: ZoneramaFolder | None = None,
         secret_id: SecretId | None = None,
+        session: ZoneramaSession | None = None,
+        info: AlbumInfo | None = None,
     ):
         self.id = id
         self.folder = folder
         self.secret_id = secret_id
-        self.refresh_info()
+        if session is None and folder is not None:
+            session = folder.session
+        self.session = session
+
+        self._name = None if info is None else info.name
+        self._downloadable = None if info is None else info.downloadable
+        self._size = None if info is None else info.size
 
     def refresh_info(self) -> None:
-        self.info = get_album_info(self.id, self.secret_id)
+        """Fetches all the info of the album at once."""
+        info = get_album_info(self.id, self.secret_id, self.session)
+        self._name = info.name
+        self._downloadable = info.downloadable
+        self._size = info.size
+
+    def _refresh_meta(self) -> None:
+        meta = get_album_meta(self.id, self.secret_id, self.session)
+        self._name = _album_name_from_meta(meta)
+        self._downloadable = _album_downloadable_from_meta(meta)
+
+    def _refresh_size(self) -> None:
+        self._size = get_album_size(self.id, True, True, self.secret_id, self.session)
+
+    @property
+    def info(self) -> AlbumInfo:
+        if self._name is None and self._size is None:
+            self.refresh_info()
+        return AlbumInfo(self.name, self.downloadable, self.size)
 
     @property
     def name(self) -> str:
-        return self.info.name
+        if self._name is None:
+            self._refresh_meta()
+        assert self._name is not None
+        return self._name
+
+    @property
+    def downloadable(self) -> bool:
+        if self._downloadable is None:
+            self._refresh_meta()
+        assert self._downloadable is not None
+        return self._downloadable
+
+    @property
+    def size(self) -> AlbumSize:
+        if self._size is None:
+            self._refresh_size()
+        assert self._size is not None
+        return self._size
 
     @property
     def photo_count(self) -> int:
-        return self.info.size.photo_count
+        return self.size.photo_count
 
     @property
     def video_count(self) -> int:
-        return self.info.size.video_count
+        return self.size.video_count
 
     @property
     def zip_size(self) -> int:
-        return self.info.size.zip_size
+        return self.size.zip_size
 
     @cached_property
     def photos(self) -> list[ZoneramaPhoto]:
         return self._get_photos()
 
+    def iter_photos(
+        self, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ZoneramaPhoto]:
+        """Yields the photos of the album, fetching them page by page.
+
+        Args:
+            page_size (int, optional): The number of items fetched per request. \
+                Defaults to DEFAULT_PAGE_SIZE.
+        """
+        for photo_id in iter_album_photos(self.id, page_size, session=self.session):
+            yield ZoneramaPhoto(photo_id, self)
+
     def _get_photos(self) -> list[ZoneramaPhoto]:
-        return [ZoneramaPhoto(photo_id, self) for photo_id in get_album_photos(self.id)]
+        return [
+            ZoneramaPhoto(photo_id, self)
+            for photo_id in get_album_photos(self.id, self.session)
+        ]
 
     def download(
         self,
@@ -69,10 +150,16 @@ class ZoneramaAlbum:
         original: bool = False,
         av1: bool = False,
         raw: bool = False,
-        sleep_for: float = 5.0,
-    ) -> None:
+        sleep_for: float | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resume: bool = True,
+        segments: int = 1,
+        polling: PollingStrategy | None = None,
+        profiler: DownloadProfiler | None = None,
+    ) -> str:
         """Downloads the album as a ZIP file. \
-            If the author has prohibited downloads, downloads an empty archive.
+            If the author has prohibited downloads, downloads an empty archive. \
+            An interrupted download is resumed by calling the method again.
 
         Args:
             destination_folder (str): The destination folder for the ZIP file.
@@ -81,10 +168,29 @@ class ZoneramaAlbum:
             original (bool, optional): Unknown. Defaults to False.
             av1 (bool, optional): Whether the av1 codec should be preferred when available. Defaults to False.
             raw (bool, optional): Whether raw files should be included when available. Defaults to False.
-            sleep_for (float, optional): The time for which the function sleeps \
-                while the file is not ready, in seconds. Defaults to 5.0.
+            sleep_for (float | None, optional): The time for which the function sleeps \
+                while the file is not ready, in seconds. \
+                Shorthand for a fixed polling strategy. Defaults to None.
+            chunk_size (int, optional): The size of the buffer \
+                used to stream the ZIP file to disk, in bytes. \
+                Defaults to DEFAULT_CHUNK_SIZE.
+            resume (bool, optional): Whether to resume an interrupted download \
+                of the album. Defaults to True.
+            segments (int, optional): The number of connections \
+                the ZIP file is downloaded over in parallel. Defaults to 1.
+            polling (PollingStrategy | None, optional): \
+                How often to check whether the ZIP file is ready. \
+                Defaults to an exponential backoff \
+                scaled to the estimated size of the ZIP file, \
+                giving up after DEFAULT_DEADLINE.
+            profiler (DownloadProfiler | None, optional): \
+                Adds up the time spent in each phase of the download. \
+                Defaults to None.
+
+        Returns:
+            str: The path of the downloaded ZIP file.
         """
-        download_album(
+        return download_album(
             self.id,
             self.secret_id,
             include_videos,
@@ -93,4 +199,58 @@ class ZoneramaAlbum:
             raw,
             destination_folder,
             sleep_for,
+            self.session,
+            chunk_size,
+            resume,
+            segments,
+            polling,
+            profiler,
         )
+
+    def download_photos(
+        self,
+        destination_folder: str,
+        workers: int = DEFAULT_WORKERS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        skip_existing: bool = True,
+    ) -> list[str]:
+        """Downloads the photos of the album one by one, several at once. \
+            Unlike download, does not wait for the server to generate a ZIP file.
+
+        Args:
+            destination_folder (str): The destination folder for the photos.
+            workers (int, optional): The maximum number of photos \
+                downloaded at once. Defaults to DEFAULT_WORKERS.
+            chunk_size (int, optional): The size of the buffer \
+                used to stream each photo to disk, in bytes. \
+                Defaults to DEFAULT_CHUNK_SIZE.
+            skip_existing (bool, optional): Whether to skip photos \
+                which have already been downloaded completely. Defaults to True.
+
+        Returns:
+            list[str]: The paths of the downloaded photos.
+        """
+        return download_photos(
+            [photo.id for photo in self.photos],
+            destination_folder,
+            workers,
+            self.session,
+            chunk_size,
+            skip_existing,
+        )
+
+
+def prefetch_info(
+    albums: Iterable[ZoneramaAlbum], workers: int = DEFAULT_PREFETCH_WORKERS
+) -> None:
+    """Fetches the info of many albums at once, \
+        so that later accesses to it do not wait on the network.
+
+    Args:
+        albums (Iterable[ZoneramaAlbum]): The albums.
+        workers (int, optional): The maximum number of albums \
+            fetched at once. Defaults to DEFAULT_PREFETCH_WORKERS.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(ZoneramaAlbum.refresh_info, albums):
+            pass
@@ -7,7 +7,20 @@ if TYPE_CHECKING:
 
 from zonerama_api.typing import FolderId, SecretId, FolderPassword
 from zonerama_api.folder import get_folder_albums, FolderInfo, get_folder_info
-from zonerama_api.classes.zonerama_album import ZoneramaAlbum
+from zonerama_api.classes.zonerama_album import (
+    DEFAULT_PREFETCH_WORKERS,
+    ZoneramaAlbum,
+    prefetch_info,
+)
+from zonerama_api.batch import (
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_LOOKAHEAD,
+    AlbumDownload,
+    BatchResult,
+    download_albums,
+)
+from zonerama_api.polling import PollingStrategy
+from zonerama_api.session import ZoneramaSession
 
 
 class ZoneramaFolder:
@@ -17,6 +30,7 @@ class ZoneramaFolder:
     gallery: ZoneramaGallery | None
     secret_id: SecretId | None
     password: FolderPassword | None
+    session: ZoneramaSession | None
     info: FolderInfo | None
 
     def __init__(
@@ -25,17 +39,23 @@ class ZoneramaFolder:
         gallery: ZoneramaGallery | None = None,
         secret_id: SecretId | None = None,
         password: FolderPassword | None = None,
+        session: ZoneramaSession | None = None,
+        info: FolderInfo | None = None,
     ):
         self.id = id
         self.gallery = gallery
         self.secret_id = secret_id
         self.password = password
-        if self.gallery is not None:
-            self.info = self.refresh_info()
+        if session is None and gallery is not None:
+            session = gallery.session
+        self.session = session
+        self.info = info
+        if self.info is None and self.gallery is not None:
+            self.refresh_info()
 
     def refresh_info(self) -> None:
         assert self.gallery is not None
-        self.info = get_folder_info(self.gallery.user.username, self.id)
+        self.info = get_folder_info(self.gallery.user.username, self.id, self.session)
 
     @property
     def name(self) -> str:
@@ -45,10 +65,31 @@ class ZoneramaFolder:
     @property
     def albums(self) -> list[ZoneramaAlbum]:
         """A list of albums in the folder sorted as they would appear \
-            from top left to bottom right on the web.
+            from top left to bottom right on the web. \
+            The info of the albums is fetched lazily.
         """
         return self._get_albums()
 
+    def get_albums(
+        self, prefetch: bool = False, workers: int = DEFAULT_PREFETCH_WORKERS
+    ) -> list[ZoneramaAlbum]:
+        """Returns a list of albums in the folder sorted as they would appear \
+            from top left to bottom right on the web.
+
+        Args:
+            prefetch (bool, optional): Whether to fetch the info of all albums \
+                right away, several at once. Defaults to False.
+            workers (int, optional): The maximum number of albums \
+                fetched at once. Defaults to DEFAULT_PREFETCH_WORKERS.
+
+        Returns:
+            list[ZoneramaAlbum]: A list of album objects representing albums in the folder.
+        """
+        albums = self._get_albums()
+        if prefetch:
+            prefetch_info(albums, workers)
+        return albums
+
     def _get_albums(self) -> list[ZoneramaAlbum]:
         """Returns a list of albums in the folder. \
             The list is sorted as it would appear \
@@ -60,5 +101,52 @@ class ZoneramaFolder:
         """
         return [
             ZoneramaAlbum(id, self, self.secret_id)
-            for id in get_folder_albums(self.id, self.secret_id, self.password)
+            for id in get_folder_albums(
+                self.id, self.secret_id, self.password, self.session
+            )
         ]
+
+    def download(
+        self,
+        destination_folder: str,
+        include_videos: bool = True,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        polling: PollingStrategy | None = None,
+    ) -> BatchResult:
+        """Downloads all albums in the folder as ZIP files, \
+            requesting the ZIP files of several albums ahead, \
+            so that their generation overlaps with the downloads.
+
+        Args:
+            destination_folder (str): The destination folder for the ZIP files.
+            include_videos (bool, optional): Whether videos are included \
+                or just their thumbnails. Defaults to True.
+            lookahead (int, optional): The maximum number of ZIP files \
+                requested but not yet being downloaded. \
+                Defaults to DEFAULT_LOOKAHEAD.
+            download_workers (int, optional): The maximum number of ZIP files \
+                downloaded at once. Defaults to DEFAULT_DOWNLOAD_WORKERS.
+            polling (PollingStrategy | None, optional): \
+                How often to check whether the ZIP files are ready. \
+                Defaults to an exponential backoff \
+                giving up after DEFAULT_DEADLINE.
+
+        Returns:
+            BatchResult: The paths of the downloaded ZIP files \
+                and the exceptions of the failed albums, by album ID.
+        """
+        return download_albums(
+            [
+                AlbumDownload(id, self.secret_id)
+                for id in get_folder_albums(
+                    self.id, self.secret_id, self.password, self.session
+                )
+            ],
+            destination_folder,
+            include_videos,
+            lookahead=lookahead,
+            download_workers=download_workers,
+            polling=polling,
+            session=self.session,
+        )
@@ -7,22 +7,34 @@ if TYPE_CHECKING:
 
 from zonerama_api.classes.zonerama_folder import ZoneramaFolder
 from zonerama_api.classes.zonerama_user import ZoneramaUser
-from zonerama_api.gallery import GalleryInfo, get_gallery_info, get_user_public_folders
-from zonerama_api.typing import UserIdentifier
+from zonerama_api.folder import FolderInfo
+from zonerama_api.gallery import GalleryInfo, get_profile_info
+from zonerama_api.session import ZoneramaSession
+from zonerama_api.typing import FolderId, UserIdentifier
 
 
 class ZoneramaGallery:
     """A class representing a user's Zonerama Web Gallery."""
 
     user: ZoneramaUser
+    session: ZoneramaSession | None
     info: GalleryInfo
+    _folders: dict[FolderId, FolderInfo]
 
-    def __init__(self, identifier: UserIdentifier):
-        self.user = ZoneramaUser(identifier)
+    def __init__(
+        self, identifier: UserIdentifier, session: ZoneramaSession | None = None
+    ):
+        self.session = session
+        self.user = ZoneramaUser(identifier, session)
         self.refresh_info()
 
     def refresh_info(self) -> None:
-        self.info = get_gallery_info(self.user.username)
+        """Fetches the info of the gallery and its public folders \
+            from a single download of the profile page.
+        """
+        profile = get_profile_info(self.user.username, self.session)
+        self.info = profile.gallery
+        self._folders = profile.folders
 
     @property
     def name(self) -> str:
@@ -34,7 +46,8 @@ class ZoneramaGallery:
 
     @property
     def public_folders(self) -> list[ZoneramaFolder]:
-        """A list of public folders in the gallery. \
+        """A list of public folders in the gallery \
+            as of the last call to refresh_info. \
             The list is sorted as it appears left-to-right on the webpage.
         """
         return self._get_public_folders()
@@ -52,8 +65,8 @@ class ZoneramaGallery:
             list[ZoneramaFolder]: A list of objects representing folders in the users gallery.
         """
         return [
-            ZoneramaFolder(id, gallery=self)
-            for id in get_user_public_folders(self.user.username)
+            ZoneramaFolder(id, gallery=self, info=info)
+            for id, info in self._folders.items()
         ]
 
     def _get_public_albums(self) -> list[ZoneramaAlbum]:
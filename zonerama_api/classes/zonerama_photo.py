@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from zonerama_api.classes.zonerama_album import ZoneramaAlbum
 
+from zonerama_api.download import DEFAULT_CHUNK_SIZE
 from zonerama_api.typing import PhotoId
 from zonerama_api.photo import download_photo
 
@@ -17,5 +18,9 @@ class ZoneramaPhoto:
         self.id = id
         self.album = album
 
-    def download(self, destination_folder: str) -> None:
-        download_photo(self.id, destination_folder)
+    def download(
+        self, destination_folder: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> str:
+        return download_photo(
+            self.id, destination_folder, self.album.session, chunk_size
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from zonerama_api.gallery import get_username, is_user_id
+from zonerama_api.session import ZoneramaSession
 from zonerama_api.typing import UserId, UserIdentifier, Username
 
 
@@ -8,10 +9,12 @@ class ZoneramaUser:
     username: Username
     user_id: UserId | None
 
-    def __init__(self, identificator: UserIdentifier) -> None:
+    def __init__(
+        self, identificator: UserIdentifier, session: ZoneramaSession | None = None
+    ) -> None:
         if is_user_id(identificator):
             self.user_id = identificator
-            self.username = get_username(identificator)
+            self.username = get_username(identificator, session)
             return
 
         self.username = identificator
@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Mapping
+
+import requests
+
+from zonerama_api.exceptions import IncompleteDownloadException
+from zonerama_api.profiling import DownloadProfiler, profile_chunks
+from zonerama_api.session import ZoneramaSession
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+DEFAULT_SEGMENT_RETRIES = 3
+PARTIAL_SUFFIX = ".part"
+SIDECAR_SUFFIX = ".json"
+# Asks for the first byte only, to learn the name and size of a file
+PROBE_HEADERS = {"Accept-Encoding": "identity", "Range": "bytes=0-0"}
+
+
+@dataclass
+class PartialDownload:
+    """The state of an unfinished download. \
+        The downloaded bytes are kept in a partial file \
+        and the state in a small JSON sidecar next to it, \
+        so that a later attempt can continue from the last written byte.
+    """
+
+    path: str  # the partial file, the sidecar is path + SIDECAR_SUFFIX
+    source: dict[str, Any] = field(default_factory=dict)
+    zip_id: str | None = None
+    filename: str | None = None
+    expected_size: int | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def sidecar_path(self) -> str:
+        return self.path + SIDECAR_SUFFIX
+
+    @classmethod
+    def load(cls, path: str) -> PartialDownload:
+        """Loads the state of the partial download at path. \
+            Returns an empty state if there is none or it is unreadable.
+        """
+        try:
+            with open(path + SIDECAR_SUFFIX, "r", encoding="utf-8") as sf:
+                state = json.load(sf)
+            return cls(path=path, **state)
+        except (OSError, ValueError, TypeError):
+            return cls(path=path)
+
+    def save(self) -> None:
+        state = asdict(self)
+        del state["path"]
+
+        tmp_path = self.sidecar_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as sf:
+            json.dump(state, sf)
+        os.replace(tmp_path, self.sidecar_path)
+
+    def reset(self, source: dict[str, Any] | None = None) -> None:
+        """Throws away the downloaded bytes and all state except the source."""
+        self.truncate()
+        self.source = {} if source is None else source
+        self.zip_id = None
+        self.save()
+
+    def truncate(self) -> None:
+        """Throws away the downloaded bytes and the validators for them."""
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
+        self.filename = None
+        self.expected_size = None
+        self.etag = None
+        self.last_modified = None
+
+    def discard(self) -> None:
+        """Removes the partial file and the sidecar."""
+        for path in (self.path, self.sidecar_path):
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    @property
+    def offset(self) -> int:
+        """The number of bytes which can be resumed from."""
+        if self.filename is None:
+            return 0
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+
+def partial_download_path(destination_folder: str, name: str) -> str:
+    return os.path.join(destination_folder, f".{name}{PARTIAL_SUFFIX}")
+
+
+def content_range_start(headers: Mapping[str, str]) -> int | None:
+    mtch = re.match(r"bytes (\d+)-\d+/(\d+|\*)", headers["content-range"])
+    return None if mtch is None else int(mtch.group(1))
+
+
+def expected_size(status: int, headers: Mapping[str, str], offset: int) -> int | None:
+    """The size of the whole file being downloaded, if the response tells."""
+    if status == 206:
+        total = headers["content-range"].rsplit("/", 1)[-1]
+        return None if total == "*" else int(total)
+
+    content_length = headers.get("content-length")
+    return None if content_length is None else offset + int(content_length)
+
+
+def range_headers(partial: PartialDownload) -> dict[str, str]:
+    """The headers of a request continuing the partial download."""
+    # Ranges of compressed responses are not stable across requests
+    headers = {"Accept-Encoding": "identity"}
+    if partial.offset > 0:
+        headers["Range"] = f"bytes={partial.offset}-"
+        validator = partial.etag or partial.last_modified
+        if validator is not None:
+            headers["If-Range"] = validator
+    return headers
+
+
+def has_downloads(folder: str) -> bool:
+    """Whether folder holds any file other than a partial download, \
+        so that a file may already have been downloaded into it.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return any(
+                entry.is_file() and not entry.name.startswith(".") for entry in entries
+            )
+    except FileNotFoundError:
+        return False
+
+
+def is_complete(path: str, status: int, headers: Mapping[str, str]) -> bool:
+    """Whether the file at path already holds the whole file \
+        the response is a part of.
+    """
+    if status not in (200, 206):
+        return False
+    try:
+        return os.path.getsize(path) == expected_size(status, headers, 0)
+    except FileNotFoundError:
+        return False
+
+
+def download_resumable(
+    session: ZoneramaSession,
+    url: str,
+    partial: PartialDownload,
+    destination_folder: str,
+    check_response: Callable[[requests.Response], str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_existing: bool = False,
+    profiler: DownloadProfiler | None = None,
+) -> str:
+    """Downloads url into destination_folder, \
+        continuing the partial download with a Range request if possible. \
+        Falls back to a full restart if the server ignores the Range header \
+        or the resource has changed. The body is streamed in chunks, \
+        the complete file is atomically renamed into place.
+
+    Args:
+        session (ZoneramaSession): The session to send the request with.
+        url (str): The URL of the file.
+        partial (PartialDownload): The state of the partial download.
+        destination_folder (str): The destination folder for the file.
+        check_response (Callable[[requests.Response], str]): \
+            Validates the response and returns the name of the file.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream the file to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        skip_existing (bool, optional): Whether to skip downloading the body \
+            if a file of the same name and size already exists. \
+            Defaults to False.
+        profiler (DownloadProfiler | None, optional): \
+            Times the transfer and the disk writes. Defaults to None.
+
+    Raises:
+        IncompleteDownloadException: The connection was closed \
+            before the whole file was received. The partial file is kept.
+
+    Returns:
+        str: The path of the downloaded file.
+    """
+    offset = partial.offset
+    # A new file is decided on from the headers of the download itself
+    if skip_existing and offset == 0 and has_downloads(destination_folder):
+        path = _probe_existing(session, url, destination_folder, check_response)
+        if path is not None:
+            partial.discard()
+            return path
+
+    response = session.get(url, headers=range_headers(partial), stream=True)
+
+    if offset > 0 and response.status_code == 416:
+        response.close()
+        partial.truncate()
+        return download_resumable(
+            session,
+            url,
+            partial,
+            destination_folder,
+            check_response,
+            chunk_size,
+            skip_existing,
+            profiler,
+        )
+
+    try:
+        response.raise_for_status()
+        filename = check_response(response)
+    except BaseException:
+        response.close()
+        raise
+
+    path = os.path.join(destination_folder, filename)
+    if skip_existing and is_complete(path, response.status_code, response.headers):
+        response.close()
+        partial.discard()
+        return path
+
+    if response.status_code == 206:
+        if content_range_start(response.headers) != offset:
+            response.close()
+            partial.truncate()
+            return download_resumable(
+                session,
+                url,
+                partial,
+                destination_folder,
+                check_response,
+                chunk_size,
+                skip_existing,
+                profiler,
+            )
+    else:
+        # The server ignored the Range header or the file has changed
+        offset = 0
+
+    partial.filename = filename
+    partial.expected_size = expected_size(
+        response.status_code, response.headers, offset
+    )
+    partial.etag = response.headers.get("etag")
+    partial.last_modified = response.headers.get("last-modified")
+    partial.save()
+
+    try:
+        with open(partial.path, "r+b" if offset > 0 else "wb") as df:
+            df.seek(offset)
+            df.truncate()
+            for chunk in profile_chunks(profiler, response.iter_content(chunk_size)):
+                df.write(chunk)
+    except requests.exceptions.RequestException as e:
+        raise IncompleteDownloadException(url, partial.path) from e
+    finally:
+        response.close()
+
+    size = os.path.getsize(partial.path)
+    if partial.expected_size is not None and size != partial.expected_size:
+        raise IncompleteDownloadException(url, partial.path)
+
+    os.replace(partial.path, path)
+    partial.discard()
+    return path
+
+
+def _probe_existing(
+    session: ZoneramaSession,
+    url: str,
+    destination_folder: str,
+    check_response: Callable[[requests.Response], str],
+) -> str | None:
+    """Returns the path of the file at url \
+        if it has already been downloaded completely into destination_folder. \
+        Only its first byte is requested, so that the connection is kept alive \
+        without the whole file being sent.
+    """
+    with session.get(url, headers=PROBE_HEADERS, stream=True) as response:
+        if response.status_code not in (200, 206):
+            return None
+
+        filename = check_response(response)
+        if response.status_code == 206:
+            # Read the single byte, so that the connection is kept alive
+            response.content
+
+        path = os.path.join(destination_folder, filename)
+        if is_complete(path, response.status_code, response.headers):
+            return path
+        return None
+
+
+def _download_segment(
+    session: ZoneramaSession,
+    url: str,
+    path: str,
+    start: int,
+    end: int,
+    validator: str | None,
+    chunk_size: int,
+    retries: int,
+    profiler: DownloadProfiler | None = None,
+) -> None:
+    """Downloads the bytes start to end (inclusive) of url \
+        into the same positions of the file at path. \
+        On a dropped connection continues from the last written byte, \
+        at most retries times.
+    """
+    position = start
+    with open(path, "r+b") as df:
+        while True:
+            headers = {
+                "Accept-Encoding": "identity",
+                "Range": f"bytes={position}-{end}",
+            }
+            if validator is not None:
+                headers["If-Range"] = validator
+
+            try:
+                with session.get(url, headers=headers, stream=True) as response:
+                    response.raise_for_status()
+                    if (
+                        response.status_code != 206
+                        or content_range_start(response.headers) != position
+                    ):
+                        raise IncompleteDownloadException(url, path)
+
+                    df.seek(position)
+                    chunks = response.iter_content(chunk_size)
+                    for chunk in profile_chunks(profiler, chunks):
+                        df.write(chunk[: end + 1 - position])
+                        position += len(chunk)
+                        if position > end:
+                            break
+            except requests.exceptions.RequestException as e:
+                if retries == 0:
+                    raise IncompleteDownloadException(url, path) from e
+                retries -= 1
+                continue
+
+            if position > end:
+                return
+            if retries == 0:
+                raise IncompleteDownloadException(url, path)
+            retries -= 1
+
+
+def download_segmented(
+    session: ZoneramaSession,
+    url: str,
+    partial: PartialDownload,
+    destination_folder: str,
+    check_response: Callable[[requests.Response], str],
+    segments: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    retries: int = DEFAULT_SEGMENT_RETRIES,
+    profiler: DownloadProfiler | None = None,
+) -> str:
+    """Downloads url into destination_folder over several connections at once. \
+        The file is split into equally sized byte ranges, \
+        which are fetched in parallel into a preallocated partial file. \
+        Each range is retried on its own. \
+        Falls back to download_resumable if the server does not support ranges.
+
+    Args:
+        session (ZoneramaSession): The session to send the requests with. \
+            Its pool should hold at least segments connections per host.
+        url (str): The URL of the file.
+        partial (PartialDownload): The state of the partial download.
+        destination_folder (str): The destination folder for the file.
+        check_response (Callable[[requests.Response], str]): \
+            Validates the response and returns the name of the file.
+        segments (int): The number of ranges downloaded in parallel.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream each range to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        retries (int, optional): How many times a dropped range is retried. \
+            Defaults to DEFAULT_SEGMENT_RETRIES.
+        profiler (DownloadProfiler | None, optional): \
+            Times the transfer and the disk writes. Defaults to None.
+
+    Raises:
+        IncompleteDownloadException: A range could not be downloaded.
+
+    Returns:
+        str: The path of the downloaded file.
+    """
+    probe = session.get(url, headers=PROBE_HEADERS, stream=True)
+    try:
+        probe.raise_for_status()
+        filename = check_response(probe)
+        size = None
+        if probe.status_code == 206:
+            size = expected_size(probe.status_code, probe.headers, 0)
+            # Read the single byte, so that the connection is kept alive
+            probe.content
+        validator = probe.headers.get("etag") or probe.headers.get("last-modified")
+    finally:
+        probe.close()
+
+    if size is None or size < segments:
+        return download_resumable(
+            session,
+            url,
+            partial,
+            destination_folder,
+            check_response,
+            chunk_size,
+            profiler=profiler,
+        )
+
+    # Ranges are written out of order, so the partial file can not be resumed
+    partial.truncate()
+    partial.save()
+    with open(partial.path, "wb") as df:
+        df.truncate(size)
+
+    bounds = [size * i // segments for i in range(segments + 1)]
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        futures = [
+            executor.submit(
+                _download_segment,
+                session,
+                url,
+                partial.path,
+                start,
+                end - 1,
+                validator,
+                chunk_size,
+                retries,
+                profiler,
+            )
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+    path = os.path.join(destination_folder, filename)
+    os.replace(partial.path, path)
+    partial.discard()
+    return path
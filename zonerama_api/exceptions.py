@@ -46,3 +46,25 @@ class ZoneramaFolderLockedException(ZoneramaApiException):
 class InvalidZoneramaFolderPasswordException(ZoneramaApiException):
     folder_id: str
     password: str
+
+
+class IncompleteDownloadException(ZipDownloaderException):
+    """The connection was closed before the whole file was received. \
+        The partial file is kept, so the download can be resumed."""
+
+    url: str
+    path: str
+
+
+class ZipNotReadyException(ZipDownloaderException):
+    """The ZIP file was not generated before the polling deadline."""
+
+    id: str
+
+
+class CircuitOpenException(ZoneramaApiException):
+    """Too many requests to the host have failed recently, \
+        so further ones fail fast until it has had time to recover."""
+
+    host: str
+    retry_in: float
@@ -11,41 +11,77 @@ from zonerama_api.exceptions import (
     SecretIdNotSpecifiedException,
     ZoneramaFolderLockedException,
 )
+from zonerama_api.html import DEFAULT_PARSER, Parser, find_class, parse_document
+from zonerama_api.session import ZoneramaSession, resolve_session
 from zonerama_api.typing import AlbumId, FolderId, FolderPassword, SecretId, Username
 
 ZONERAMA_URL = "https://eu.zonerama.com"
 FOLDER_ALBUMS_URL = "https://eu.zonerama.com/Part/AlbumsInTab"
 FOLDER_UNLOCK_URL = "https://eu.zonerama.com/Web/UnlockTab"
 
+# The album ids are in the markup escaped inside a script
+_ALBUM_ID_PATTERN = re.compile(r'data-album-id=\\"([^\\]+)\\"')
+
 
 @dataclass
 class FolderInfo:
     name: str
 
 
-def get_folder_info(username: Username, folder_id: FolderId) -> FolderInfo:
-    response = requests.get(f"{ZONERAMA_URL}/{username}")
+def get_folder_info(
+    username: Username,
+    folder_id: FolderId,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> FolderInfo:
+    response = resolve_session(session).get(f"{ZONERAMA_URL}/{username}")
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "lxml")
-    tabs_list_div = soup.find(class_="profile-tabs-list")
+    return _parse_folder_info(username, folder_id, response.text, parser)
+
+
+def _parse_folder_info(
+    username: Username,
+    folder_id: FolderId,
+    html: str,
+    parser: Parser = DEFAULT_PARSER,
+) -> FolderInfo:
+    if parser == "bs4":
+        soup = BeautifulSoup(html, "lxml")
+        tabs_list_div = soup.find(class_="profile-tabs-list")
+
+        if tabs_list_div is None:
+            raise InvalidZoneramaUsernameException(username)
+        assert isinstance(tabs_list_div, Tag)
+
+        div = tabs_list_div.find("div", attrs={"data-tab-id": folder_id})
+        assert isinstance(div, Tag)
+        name = div.find("span", class_="name")
+        assert isinstance(name, Tag)
 
-    if tabs_list_div is None:
+        return FolderInfo(name=name.text)
+
+    tabs_list = find_class(parse_document(html), "profile-tabs-list")
+
+    if tabs_list is None:
         raise InvalidZoneramaUsernameException(username)
-    assert isinstance(tabs_list_div, Tag)
 
-    div = tabs_list_div.find("div", attrs={"data-tab-id": folder_id})
-    assert isinstance(div, Tag)
-    name = div.find("span", class_="name")
-    assert isinstance(name, Tag)
+    div = next(
+        element
+        for element in tabs_list.iterfind(".//div[@data-tab-id]")
+        if element.get("data-tab-id") == folder_id
+    )
+    name = find_class(div, "name", "span")
+    assert name is not None
 
-    return FolderInfo(name=name.text)
+    return FolderInfo(name=name.text_content())
 
 
 def folder_exists(
     folder_id: FolderId,
+    session: ZoneramaSession | None = None,
 ) -> bool:
-    response = requests.get(
+    response = resolve_session(session).get(
         FOLDER_ALBUMS_URL, params={"tabId": folder_id}, allow_redirects=False
     )
     # non-existent
@@ -68,8 +104,10 @@ def folder_exists(
 def is_folder_locked(
     folder_id: FolderId,
     secret_id: SecretId | None = None,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
 ) -> bool:
-    response = requests.get(
+    response = resolve_session(session).get(
         FOLDER_ALBUMS_URL,
         params={"tabId": folder_id, "secret": secret_id},
         allow_redirects=False,
@@ -79,9 +117,16 @@ def is_folder_locked(
     if response.status_code == 302:
         raise SecretIdNotSpecifiedException()
 
-    soup = BeautifulSoup(response.text, "lxml")
-    lock_i = soup.find(class_="icon-lock")
-    return lock_i is not None
+    return _parse_folder_locked(response.text, parser)
+
+
+def _parse_folder_locked(html: str, parser: Parser = DEFAULT_PARSER) -> bool:
+    if parser == "bs4":
+        soup = BeautifulSoup(html, "lxml")
+        lock_i = soup.find(class_="icon-lock")
+        return lock_i is not None
+
+    return find_class(parse_document(html), "icon-lock") is not None
 
 
 def unlock_folder(
@@ -99,11 +144,14 @@ def get_folder_albums(
     folder_id: FolderId,
     secret_id: SecretId | None = None,
     password: FolderPassword | None = None,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
 ) -> list[AlbumId]:
     """Provided with a Zonerama username and a folder id, \
         returns a list of ids of all albums in that folder. \
         The list is sorted as it would appear \
-        from top left to bottom right on the web.
+        from top left to bottom right on the web. \
+        Takes a single request unless the folder has to be unlocked.
 
     Args:
         username (Username): An existing Zonerama username with a gallery.
@@ -111,37 +159,97 @@ def get_folder_albums(
         secret_id (str | None, optional): The secret id. \
             Provide for secret folders, can be found in the URL for them. \
             Defaults to None.
+        password (FolderPassword | None, optional): The password. \
+            Provide for locked folders. Defaults to None.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Unlocking a folder stores its cookie in the session. \
+            Defaults to the module-level session.
+        parser (Parser, optional): The HTML parser. Defaults to DEFAULT_PARSER.
 
     Raises:
         InvalidZoneramaFolderIdException: \
             The provided folder id is invalid for given username.
+        SecretIdNotSpecifiedException: \
+            The folder is secret and no or a wrong secret id was provided.
+        ZoneramaFolderLockedException: \
+            The folder is locked and no password was provided.
+        InvalidZoneramaFolderPasswordException: \
+            The provided password is wrong.
 
     Returns:
         list[AlbumId]: A list of available album's IDs sorted in the aforementioned order.
     """
-    if not folder_exists(folder_id):
-        raise InvalidZoneramaFolderIdException(folder_id)
+    session = resolve_session(session)
 
-    session = requests.Session()
-
-    if is_folder_locked(folder_id, secret_id):
+    albums = _fetch_folder_albums(folder_id, secret_id, session, parser)
+    if albums is None:
         if password is None:
             raise ZoneramaFolderLockedException(folder_id, secret_id)
 
         if not unlock_folder(folder_id, password, session):
             raise InvalidZoneramaFolderPasswordException(folder_id, password)
 
+        # The page of an unlocked folder may still show the lock icon
+        albums = _fetch_folder_albums(
+            folder_id, secret_id, session, parser, check_lock=False
+        )
+        assert albums is not None
+
+    return albums
+
+
+def _fetch_folder_albums(
+    folder_id: FolderId,
+    secret_id: SecretId | None,
+    session: ZoneramaSession,
+    parser: Parser = DEFAULT_PARSER,
+    check_lock: bool = True,
+) -> list[AlbumId] | None:
     response = session.get(
         FOLDER_ALBUMS_URL,
         params={"tabId": folder_id, "secret": secret_id},
         allow_redirects=False,
     )
+    _raise_for_folder_status(folder_id, response.status_code)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "lxml")
-    script = soup.find("script")
-    assert script is not None
-    assert isinstance(script, Tag)
+    return _parse_folder_page(response.text, parser, check_lock)
+
 
-    mtchs = re.findall(r'data-album-id=\\"([^\\]+)\\"', str(script))
+def _raise_for_folder_status(folder_id: FolderId, status: int) -> None:
+    # non-existent or deleted
+    if status in (404, 500):
+        raise InvalidZoneramaFolderIdException(folder_id)
+
+    # secret
+    if status == 302:
+        raise SecretIdNotSpecifiedException()
+
+
+def _parse_folder_page(
+    html: str, parser: Parser = DEFAULT_PARSER, check_lock: bool = True
+) -> list[AlbumId] | None:
+    """Parses the album ids from a page of Part/AlbumsInTab. \
+        Returns None if the folder is locked, unless check_lock is False.
+    """
+    if parser == "bs4":
+        soup = BeautifulSoup(html, "lxml")
+        if check_lock and soup.find(class_="icon-lock") is not None:
+            return None
+
+        script = soup.find("script")
+        assert script is not None
+        assert isinstance(script, Tag)
+        text = str(script)
+    else:
+        document = parse_document(html)
+        if check_lock and find_class(document, "icon-lock") is not None:
+            return None
+
+        script = document.find(".//script")
+        assert script is not None
+        text = script.text or ""
+
+    mtchs = re.findall(_ALBUM_ID_PATTERN, text)
     return mtchs
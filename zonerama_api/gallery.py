@@ -1,9 +1,21 @@
 from dataclasses import dataclass
 
-import requests
+import lxml.html
 from bs4 import BeautifulSoup, Tag
 
 from zonerama_api.exceptions import InvalidZoneramaUsernameException
+from zonerama_api.folder import FolderInfo
+from zonerama_api.html import (
+    DEFAULT_PARSER,
+    Parser,
+    find_class,
+    meta_from_document,
+    meta_from_soup,
+    parse_document,
+    parse_meta,
+    read_head,
+)
+from zonerama_api.session import ZoneramaSession, resolve_session
 from zonerama_api.typing import FolderId, UserId, Username
 
 ZONERAMA_URL = "https://eu.zonerama.com"
@@ -16,37 +28,115 @@ class GalleryInfo:
     description: str
 
 
-def get_gallery_info(username: Username) -> GalleryInfo:
-    response = requests.get(
+@dataclass
+class ProfileInfo:
+    gallery: GalleryInfo
+    folders: dict[FolderId, FolderInfo]  # sorted as they appear left-to-right
+
+
+def get_profile_info(
+    username: Username,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> ProfileInfo:
+    """Provided with a Zonerama username, returns the info of the gallery \
+        together with the ids and the info of its public folders (tabs), \
+        all parsed from a single download of the profile page.
+
+    Args:
+        username (Username): An existing Zonerama username with a gallery.
+        session (ZoneramaSession | None, optional): \
+            The session to send the request with. \
+            Defaults to the module-level session.
+        parser (Parser, optional): The HTML parser. Defaults to DEFAULT_PARSER.
+
+    Raises:
+        InvalidZoneramaUsernameException: \
+            The provided username is invalid.
+
+    Returns:
+        ProfileInfo: The info of the gallery and its public folders, \
+            sorted in order which appears as left-to-right on the webpage.
+    """
+    response = resolve_session(session).get(
         f"{ZONERAMA_URL}/{username}",
         allow_redirects=False,
     )
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, features="lxml")
-    meta = soup.find_all("meta")
+    return _parse_profile(username, response.text, parser)
+
+
+def _parse_profile(
+    username: Username, html: str, parser: Parser = DEFAULT_PARSER
+) -> ProfileInfo:
+    folders: dict[FolderId, FolderInfo] = {}
+
+    if parser == "bs4":
+        soup = BeautifulSoup(html, features="lxml")
+        tabs_list_div = _find_tabs_list_div(username, soup)
+
+        for div in tabs_list_div.find_all(class_="item"):
+            name = div.find("span", class_="name")
+            assert isinstance(name, Tag)
 
-    assert all(map(lambda x: isinstance(x, Tag), meta))
+            folders[div["data-tab-id"]] = FolderInfo(name=name.text)
 
-    meta_dict: dict[str, str] = {}
-    for tag in meta:
-        key, value = tag["property"], tag["content"]
-        assert isinstance(key, str) and isinstance(value, str)
+        return ProfileInfo(
+            gallery=_gallery_info_from_meta(meta_from_soup(soup)), folders=folders
+        )
 
-        meta_dict[key] = value
+    document = parse_document(html)
+    tabs_list = _find_tabs_list_element(username, document)
 
-    return GalleryInfo(
-        name=meta_dict["og:title"], description=meta_dict["og:description"]
+    for element in tabs_list.find_class("item"):
+        name = find_class(element, "name", "span")
+        assert name is not None
+
+        folders[element.get("data-tab-id")] = FolderInfo(name=name.text_content())
+
+    return ProfileInfo(
+        gallery=_gallery_info_from_meta(meta_from_document(document)), folders=folders
     )
 
 
-def get_user_public_folders(username: Username) -> list[FolderId]:
+def get_gallery_info(
+    username: Username,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> GalleryInfo:
+    # Only the <head> is read, the <meta> tags are all in it
+    with resolve_session(session).get(
+        f"{ZONERAMA_URL}/{username}",
+        allow_redirects=False,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+
+        html = read_head(response)
+
+    return _gallery_info_from_meta(parse_meta(html, parser))
+
+
+def _gallery_info_from_meta(meta: dict[str, str]) -> GalleryInfo:
+    return GalleryInfo(name=meta["og:title"], description=meta["og:description"])
+
+
+def get_user_public_folders(
+    username: Username,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> list[FolderId]:
     """Provided with a Zonerama username, \
         returns a list of ids of folders (tabs) in the user's gallery \
         sorted in order which appears as left-to-right on the webpage.
 
     Args:
         username (Username): An existing Zonerama username with a gallery.
+        session (ZoneramaSession | None, optional): \
+            The session to send the request with. \
+            Defaults to the module-level session.
+        parser (Parser, optional): The HTML parser. Defaults to DEFAULT_PARSER.
 
     Raises:
         InvalidZoneramaUsernameException: \
@@ -56,33 +146,76 @@ def get_user_public_folders(username: Username) -> list[FolderId]:
         list[FolderId]: A list of public folders in the user's gallery \
         sorted in the aforementioned order.
     """
-    response = requests.get(f"{ZONERAMA_URL}/{username}")
+    response = resolve_session(session).get(f"{ZONERAMA_URL}/{username}")
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "lxml")
+    return _parse_public_folders(username, response.text, parser)
+
+
+def _parse_public_folders(
+    username: Username, html: str, parser: Parser = DEFAULT_PARSER
+) -> list[FolderId]:
+    if parser == "bs4":
+        soup = BeautifulSoup(html, "lxml")
+        tabs_list_div = _find_tabs_list_div(username, soup)
+
+        divs = tabs_list_div.find_all(class_="item")
+
+        return [div["data-tab-id"] for div in divs]
+
+    tabs_list = _find_tabs_list_element(username, parse_document(html))
+    return [element.get("data-tab-id") for element in tabs_list.find_class("item")]
+
+
+def _find_tabs_list_div(username: Username, soup: BeautifulSoup) -> Tag:
     tabs_list_div = soup.find(class_="profile-tabs-list")
 
     if tabs_list_div is None:
         raise InvalidZoneramaUsernameException(username)
     assert isinstance(tabs_list_div, Tag)
 
-    divs = tabs_list_div.find_all(class_="item")
+    return tabs_list_div
+
+
+def _find_tabs_list_element(
+    username: Username, document: lxml.html.HtmlElement
+) -> lxml.html.HtmlElement:
+    tabs_list = find_class(document, "profile-tabs-list")
+
+    if tabs_list is None:
+        raise InvalidZoneramaUsernameException(username)
 
-    return [div["data-tab-id"] for div in divs]
+    return tabs_list
 
 
 def is_user_id(identificator: str) -> bool:
     return identificator.isdigit()
 
 
-def get_username(user_id: UserId) -> Username:
-    response = requests.get(f"{PROFILE_BASE_URL}/{user_id}")
-    response.raise_for_status()
+def get_username(
+    user_id: UserId,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> Username:
+    # Only the <head> is read, the <meta> tags are all in it
+    with resolve_session(session).get(
+        f"{PROFILE_BASE_URL}/{user_id}", stream=True
+    ) as response:
+        response.raise_for_status()
+
+        html = read_head(response)
+
+    return _parse_username(html, parser)
+
+
+def _parse_username(html: str, parser: Parser = DEFAULT_PARSER) -> Username:
+    if parser == "bs4":
+        soup = BeautifulSoup(html, features="lxml")
+        account_tag = soup.find("meta", property="og:title")
+        assert isinstance(account_tag, Tag)
 
-    soup = BeautifulSoup(response.text, features="lxml")
-    account_tag = soup.find("meta", property="og:title")
-    assert isinstance(account_tag, Tag)
+        username = account_tag["content"]
+        assert isinstance(username, str)
+        return username
 
-    username = account_tag["content"]
-    assert isinstance(username, str)
-    return username
+    return parse_meta(html, parser)["og:title"]
@@ -0,0 +1,105 @@
+from typing import Literal
+
+import lxml.html
+import requests
+from bs4 import BeautifulSoup, Tag
+
+# "lxml" queries the lxml tree directly, "bs4" builds a BeautifulSoup tree
+# on top of it, which is several times slower but more forgiving
+Parser = Literal["lxml", "bs4"]
+DEFAULT_PARSER: Parser = "lxml"
+
+HEAD_END = b"</head>"
+HEAD_CHUNK_SIZE = 16 * 1024  # in bytes
+# Reading at most this many bytes of the rest of a page to reuse the connection
+# is cheaper than opening a new one
+DRAIN_LIMIT = 64 * 1024
+
+
+def parse_document(html: str) -> lxml.html.HtmlElement:
+    return lxml.html.document_fromstring(html)
+
+
+def read_head(response: requests.Response, chunk_size: int = HEAD_CHUNK_SIZE) -> str:
+    """Reads a streamed HTML response up to the end of its <head>, \
+        which holds all the <meta> tags, and closes it. \
+        The rest of the page is only read if it is short enough \
+        for the connection to be worth returning to the pool.
+
+    Args:
+        response (requests.Response): A response requested with stream=True.
+        chunk_size (int, optional): The number of bytes read at once. \
+            Defaults to HEAD_CHUNK_SIZE.
+
+    Returns:
+        str: The page up to and including </head>, \
+            or the whole page if it has no </head>.
+    """
+    data = bytearray()
+    chunks = response.iter_content(chunk_size)
+    for chunk in chunks:
+        # The end tag may be split between two chunks
+        start = max(len(data) - len(HEAD_END) + 1, 0)
+        data += chunk
+
+        end = data[start:].lower().find(HEAD_END)
+        if end != -1:
+            del data[start + end + len(HEAD_END) :]
+            if _remaining_bytes(response) <= DRAIN_LIMIT:
+                for _ in chunks:
+                    pass
+            break
+
+    response.close()
+    return data.decode(response.encoding or "utf-8", errors="replace")
+
+
+def _remaining_bytes(response: requests.Response) -> float:
+    length = response.headers.get("content-length")
+    tell = getattr(response.raw, "tell", None)
+    if length is None or tell is None:
+        return float("inf")
+
+    return int(length) - tell()
+
+
+def parse_meta(html: str, parser: Parser = DEFAULT_PARSER) -> dict[str, str]:
+    """Returns the contents of the <meta> tags of a page by their property."""
+    if parser == "bs4":
+        return meta_from_soup(BeautifulSoup(html, features="lxml"))
+
+    return meta_from_document(parse_document(html))
+
+
+def meta_from_document(document: lxml.html.HtmlElement) -> dict[str, str]:
+    return {
+        tag.get("property"): tag.get("content")
+        for tag in document.iterfind(".//meta[@property][@content]")
+    }
+
+
+def meta_from_soup(soup: BeautifulSoup) -> dict[str, str]:
+    meta = soup.find_all("meta")
+
+    assert all(map(lambda x: isinstance(x, Tag), meta))
+
+    result: dict[str, str] = {}
+    for tag in meta:
+        key, value = tag["property"], tag["content"]
+        assert isinstance(key, str) and isinstance(value, str)
+
+        result[key] = value
+
+    return result
+
+
+def find_class(
+    element: lxml.html.HtmlElement, class_name: str, tag: str | None = None
+) -> lxml.html.HtmlElement | None:
+    """Returns the first element within element with the class \
+        and optionally the tag, like BeautifulSoup's find(tag, class_=class_name).
+    """
+    for descendant in element.find_class(class_name):
+        if tag is None or descendant.tag == tag:
+            return descendant
+    return None
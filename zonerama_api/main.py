@@ -1,16 +1,106 @@
+import cProfile
+import json
+import sys
+from time import perf_counter
+
 from zonerama_api.parse_arguments import parse, args_t
 from zonerama_api.classes.zonerama_album import ZoneramaAlbum
+from zonerama_api.metrics import RequestMetrics
+from zonerama_api.polling import PollingProgress, PollingStrategy
+from zonerama_api.profiling import DownloadProfiler
+from zonerama_api.session import ZoneramaSession
+
+
+def run_zip(
+    args: args_t,
+    session: ZoneramaSession | None = None,
+    profiler: DownloadProfiler | None = None,
+) -> str:
+    def report(progress: PollingProgress) -> None:
+        print(
+            f"Waiting on album: {album.id}, {progress.next_interval:.1f}s",
+            file=sys.stderr,
+        )
+
+    deadline = args.deadline or None
+    if args.sleep is None:
+        polling = PollingStrategy(deadline=deadline, on_progress=report)
+    else:
+        polling = PollingStrategy.fixed(
+            args.sleep, deadline=deadline, on_progress=report
+        )
+
+    album = ZoneramaAlbum(args.album_id, None, args.secret_id, session)
+    return album.download(
+        destination_folder=args.output,
+        include_videos=args.videos,
+        segments=args.segments,
+        polling=polling,
+        profiler=profiler,
+    )
+
+
+def run_profiled(args: args_t) -> None:
+    """Runs the download recording the time spent in each phase \
+        and the requests per endpoint, optionally under cProfile, \
+        and writes a JSON report to args.profile.
+    """
+    metrics = RequestMetrics()
+    profiler = DownloadProfiler()
+    profile = cProfile.Profile() if args.cprofile is not None else None
+
+    began = perf_counter()
+    error = None
+    try:
+        with ZoneramaSession(metrics=metrics) as session:
+            if profile is not None:
+                profile.enable()
+            try:
+                run_zip(args, session, profiler)
+            finally:
+                if profile is not None:
+                    profile.disable()
+    except Exception as e:
+        error = e
+    wall_time = perf_counter() - began
+
+    report = profiler.report()
+    report["album_id"] = args.album_id
+    report["wall_time"] = wall_time
+    report["mb_s"] = report["bytes"] / 1024**2 / wall_time
+    report["requests"] = {
+        endpoint: {
+            "count": stats.requests,
+            "errors": stats.errors,
+            "mean_latency": stats.mean_latency,
+            "bytes_in": stats.bytes_in,
+        }
+        for endpoint, stats in metrics.stats().items()
+    }
+    report["error"] = None if error is None else repr(error)
+    if profile is not None:
+        profile.dump_stats(args.cprofile)
+        report["cprofile"] = args.cprofile
+
+    with open(args.profile, "w") as f:
+        json.dump(report, f, indent=2)
 
+    for phase, seconds in report["phases"].items():
+        print(f"{phase:<15} {seconds:8.2f}s", file=sys.stderr)
+    print(
+        f"{'total':<15} {wall_time:8.2f}s {report['mb_s']:8.2f} MB/s", file=sys.stderr
+    )
 
-def run_zip(args: args_t) -> None:
-    album = ZoneramaAlbum(args.album_id, None, args.secret_id)
-    album.download(destination_folder=args.output, include_videos=args.videos, sleep_for=args.sleep)
+    if error is not None:
+        raise error
 
 
 def main():
     args = parse()
 
     match args.download_type:
+        case "zip" if args.profile is not None:
+            run_profiled(args)
         case "zip":
             run_zip(args)
         case _:
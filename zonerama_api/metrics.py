@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import bisect
+import copy
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Logical endpoints by the path of their URLs, the first match applies
+ENDPOINTS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(rf"^/{name}(/|$)"), name)
+    for name in (
+        "Link/Album",
+        "Download/Size",
+        "Download/Photo",
+        "JSON/FlowLayout_PhotosInAlbum",
+        "Zip/Album",
+        "Zip/IsReady",
+        "Zip/Download",
+        "Part/AlbumsInTab",
+        "Part/PhotoOnSlide",
+        "Web/UnlockTab",
+        "Profile",
+    )
+] + [(re.compile(r"^/[^/]+$"), "profile page")]
+OTHER_ENDPOINT = "other"
+
+
+def endpoint_name(url: str) -> str:
+    path = urlsplit(url).path
+    for pattern, name in ENDPOINTS:
+        if pattern.search(path):
+            return name
+    return OTHER_ENDPOINT
+
+
+@dataclass
+class RequestStart:
+    endpoint: str
+    method: str
+    url: str
+    started: float  # perf_counter time
+
+
+@dataclass
+class RequestEnd:
+    start: RequestStart
+    status: int | None  # None if the request raised
+    elapsed: float  # in seconds, until the body was read unless streamed
+    bytes_out: int  # the size of the request body
+    bytes_in: int  # the size of the response body, as declared if streamed
+    error: BaseException | None = None
+    from_cache: bool = False  # answered from the cache without a request
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0  # requests which raised
+    cache_hits: int = 0  # responses from the cache, not counted as requests
+    bytes_out: int = 0
+    bytes_in: int = 0
+    latency_sum: float = 0.0  # in seconds
+    # Requests by the first bucket of LATENCY_BUCKETS their latency fits in,
+    # the last item counts those slower than all of them
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_sum / self.requests if self.requests else 0.0
+
+
+class RequestMetrics:
+    """Counts the requests, bytes, latencies and statuses per logical endpoint \
+        of the sessions it is given to and calls hooks as requests start and end. \
+        Thread-safe, so one instance may be shared by many sessions.
+    """
+
+    on_request_start: list[Callable[[RequestStart], None]]
+    on_request_end: list[Callable[[RequestEnd], None]]
+    _endpoints: dict[str, EndpointStats]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.on_request_start = []
+        self.on_request_end = []
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def start(self, method: str, url: str) -> RequestStart:
+        start = RequestStart(endpoint_name(url), method, url, perf_counter())
+        for hook in self.on_request_start:
+            hook(start)
+        return start
+
+    def end(
+        self,
+        start: RequestStart,
+        status: int | None,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+        error: BaseException | None = None,
+        from_cache: bool = False,
+    ) -> None:
+        end = RequestEnd(
+            start,
+            status,
+            perf_counter() - start.started,
+            bytes_out,
+            bytes_in,
+            error,
+            from_cache,
+        )
+        with self._lock:
+            stats = self._endpoints.setdefault(start.endpoint, EndpointStats())
+            if from_cache:
+                stats.cache_hits += 1
+            else:
+                stats.requests += 1
+                stats.bytes_out += bytes_out
+                stats.bytes_in += bytes_in
+                stats.latency_sum += end.elapsed
+                bucket = bisect.bisect_left(LATENCY_BUCKETS, end.elapsed)
+                stats.latency_buckets[bucket] += 1
+                if status is None:
+                    stats.errors += 1
+                else:
+                    stats.statuses[status] += 1
+
+        for hook in self.on_request_end:
+            hook(end)
+
+    def stats(self) -> dict[str, EndpointStats]:
+        """Returns a snapshot of the statistics by endpoint."""
+        with self._lock:
+            return copy.deepcopy(self._endpoints)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+
+    def to_prometheus(self, prefix: str = "zonerama") -> str:
+        """Formats the statistics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name: str, kind: str, help: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        snapshot = sorted(self.stats().items())
+
+        metric = family("requests_total", "counter", "Responses by status.")
+        for endpoint, stats in snapshot:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(
+                    f'{metric}{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+
+        for name, attribute, help in (
+            ("request_errors_total", "errors", "Requests which raised."),
+            ("cache_hits_total", "cache_hits", "Responses served from the cache."),
+            ("sent_bytes_total", "bytes_out", "Bytes of request bodies."),
+            ("received_bytes_total", "bytes_in", "Bytes of response bodies."),
+        ):
+            metric = family(name, "counter", help)
+            for endpoint, stats in snapshot:
+                value = getattr(stats, attribute)
+                lines.append(f'{metric}{{endpoint="{endpoint}"}} {value}')
+
+        metric = family(
+            "request_duration_seconds", "histogram", "Request latency in seconds."
+        )
+        for endpoint, stats in snapshot:
+            cumulative = 0
+            for bound, count in zip(
+                [*map(str, LATENCY_BUCKETS), "+Inf"], stats.latency_buckets
+            ):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{metric}_sum{{endpoint="{endpoint}"}} {stats.latency_sum}')
+            lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {stats.requests}')
+
+        return "\n".join(lines) + "\n"
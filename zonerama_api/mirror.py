@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable
+
+import requests
+
+from zonerama_api.album import AlbumSize
+from zonerama_api.batch import AlbumException
+from zonerama_api.classes.zonerama_album import ZoneramaAlbum
+from zonerama_api.classes.zonerama_gallery import ZoneramaGallery
+from zonerama_api.exceptions import ZoneramaDownloaderException
+from zonerama_api.photo import DEFAULT_WORKERS, download_photo
+from zonerama_api.session import ZoneramaSession, resolve_session
+from zonerama_api.typing import AlbumId, PhotoId, UserIdentifier
+
+MANIFEST_NAME = ".zonerama-manifest.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS albums (
+    album_id TEXT PRIMARY KEY,
+    photo_count INTEGER NOT NULL,
+    zip_size INTEGER NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS photos (
+    photo_id TEXT PRIMARY KEY,
+    album_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+class Manifest:
+    """A record of the albums and photos already mirrored. \
+        Backed by SQLite, every completed photo is committed on its own, \
+        so an interrupted mirror resumes without redoing completed work.
+    """
+
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Manifest:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def is_album_complete(self, album_id: AlbumId, size: AlbumSize) -> bool:
+        """Whether all the photos of the album were downloaded, \
+            their files are still intact and its size has not changed since.
+        """
+        row = self._connection.execute(
+            "SELECT photo_count, zip_size, complete FROM albums WHERE album_id = ?",
+            (album_id,),
+        ).fetchone()
+        if row != (size.photo_count, size.zip_size, 1):
+            return False
+
+        rows = self._connection.execute(
+            "SELECT path, size FROM photos WHERE album_id = ?", (album_id,)
+        )
+        return all(_is_intact(path, size) for path, size in rows)
+
+    def complete_photos(self, album_id: AlbumId) -> set[PhotoId]:
+        """The photos of the album downloaded before, \
+            whose files are still present and of the recorded size.
+        """
+        rows = self._connection.execute(
+            "SELECT photo_id, path, size FROM photos WHERE album_id = ?", (album_id,)
+        )
+        return {photo_id for photo_id, path, size in rows if _is_intact(path, size)}
+
+    def add_photo(self, photo_id: PhotoId, album_id: AlbumId, path: str) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO photos VALUES (?, ?, ?, ?)",
+                (photo_id, album_id, path, os.path.getsize(path)),
+            )
+
+    def set_album(self, album_id: AlbumId, size: AlbumSize, complete: bool) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO albums VALUES (?, ?, ?, ?)",
+                (album_id, size.photo_count, size.zip_size, int(complete)),
+            )
+
+
+def _is_intact(path: str, size: int) -> bool:
+    return os.path.isfile(path) and os.path.getsize(path) == size
+
+
+@dataclass
+class MirrorResult:
+    albums_skipped: int = 0
+    photos_downloaded: int = 0
+    photos_skipped: int = 0
+    errors: dict[PhotoId, Exception] = field(default_factory=dict)
+    album_errors: dict[AlbumId, Exception] = field(default_factory=dict)
+
+
+def mirror_album(
+    album: ZoneramaAlbum,
+    destination_folder: str,
+    manifest: Manifest,
+    workers: int = DEFAULT_WORKERS,
+    session: ZoneramaSession | None = None,
+    result: MirrorResult | None = None,
+) -> MirrorResult:
+    """Downloads the photos of an album missing from the manifest \
+        into a subfolder of destination_folder named by the album's ID.
+
+    Args:
+        album (ZoneramaAlbum): The album.
+        destination_folder (str): The root folder of the mirror.
+        manifest (Manifest): The manifest of the mirror.
+        workers (int, optional): The maximum number of photos \
+            downloaded at once. Defaults to DEFAULT_WORKERS.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the session of the album.
+        result (MirrorResult | None, optional): \
+            The result to add the counts to. Defaults to a new one.
+
+    Returns:
+        MirrorResult: The counts of downloaded and skipped photos \
+            and the exceptions of the failed ones.
+    """
+    session = resolve_session(album.session if session is None else session)
+    result = MirrorResult() if result is None else result
+
+    # Any change to the album changes its size, which is cheaper to fetch
+    # than the list of its photos
+    size = album.size
+    if manifest.is_album_complete(album.id, size):
+        result.albums_skipped += 1
+        return result
+
+    album_folder = os.path.join(destination_folder, album.id)
+    os.makedirs(album_folder, exist_ok=True)
+
+    photos = [photo.id for photo in album.photos]
+    complete = manifest.complete_photos(album.id)
+    missing = [photo_id for photo_id in photos if photo_id not in complete]
+    result.photos_skipped += len(photos) - len(missing)
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # The manifest knows these are missing, so do not probe for them
+        futures = {
+            executor.submit(download_photo, photo_id, album_folder, session): photo_id
+            for photo_id in missing
+        }
+        # Only this thread writes to the manifest
+        for future in as_completed(futures):
+            photo_id = futures[future]
+            try:
+                path = future.result()
+            except (ZoneramaDownloaderException, requests.RequestException) as e:
+                result.errors[photo_id] = e
+                failed = True
+                continue
+
+            manifest.add_photo(photo_id, album.id, path)
+            result.photos_downloaded += 1
+
+    manifest.set_album(album.id, size, not failed)
+    return result
+
+
+def mirror_gallery(
+    identifier: UserIdentifier,
+    destination_folder: str,
+    workers: int = DEFAULT_WORKERS,
+    session: ZoneramaSession | None = None,
+    on_album: Callable[[ZoneramaAlbum], None] | None = None,
+) -> MirrorResult:
+    """Mirrors the public albums of a gallery into destination_folder, \
+        one subfolder per album. A manifest in destination_folder records \
+        what has been downloaded, so each run only fetches albums \
+        and photos which are new or were not completed before.
+
+    Args:
+        identifier (UserIdentifier): The username or the user ID.
+        destination_folder (str): The root folder of the mirror.
+        workers (int, optional): The maximum number of photos \
+            downloaded at once. Defaults to DEFAULT_WORKERS.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+        on_album (Callable[[ZoneramaAlbum], None] | None, optional): \
+            Called before each album is mirrored. Defaults to None.
+
+    Returns:
+        MirrorResult: The counts of skipped albums, downloaded \
+            and skipped photos and the exceptions of the failed photos \
+            and albums. A failure of one album does not stop the others.
+    """
+    os.makedirs(destination_folder, exist_ok=True)
+    gallery = ZoneramaGallery(identifier, session)
+    result = MirrorResult()
+
+    with Manifest(os.path.join(destination_folder, MANIFEST_NAME)) as manifest:
+        for album in gallery.public_albums:
+            if on_album is not None:
+                on_album(album)
+            try:
+                mirror_album(
+                    album, destination_folder, manifest, workers, session, result
+                )
+            except AlbumException as e:
+                result.album_errors[album.id] = e
+
+    return result
@@ -1,5 +1,7 @@
 import argparse
 
+from zonerama_api.polling import DEFAULT_DEADLINE
+
 args_t = argparse.Namespace
 
 
@@ -12,6 +14,29 @@ def parse() -> args_t:
     parser.add_argument("-aid", "--album_id", type=str, required=True)
     parser.add_argument("-sid", "--secret_id", type=str)
     parser.add_argument("-v", "--videos", action="store_false")
-    parser.add_argument("-s", "--sleep", type=float, default=5.0)
+    parser.add_argument("-s", "--sleep", type=float)
+    parser.add_argument(
+        "-d",
+        "--deadline",
+        type=float,
+        default=DEFAULT_DEADLINE,
+        help="seconds to wait for the ZIP file, 0 to wait forever",
+    )
+    parser.add_argument("-n", "--segments", type=int, default=1)
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="REPORT",
+        help="time each phase of the download and write a JSON report",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        metavar="STATS",
+        help="with --profile, also run under cProfile and dump its stats here",
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.cprofile is not None and args.profile is None:
+        parser.error("--cprofile requires --profile")
+    return args
@@ -1,33 +1,115 @@
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Mapping
 
 import requests
 from bs4 import BeautifulSoup, Tag
 
+from zonerama_api.download import (
+    DEFAULT_CHUNK_SIZE,
+    PartialDownload,
+    download_resumable,
+    has_downloads,
+    partial_download_path,
+)
 from zonerama_api.exceptions import InvalidPhotoIdException
+from zonerama_api.html import DEFAULT_PARSER, Parser, find_class, parse_document
+from zonerama_api.session import ZoneramaSession, resolve_session
 from zonerama_api.typing import PhotoId
 
 PHOTO_DOWNLOAD_URL = "https://zonerama.com/Download/Photo"
 PHOTO_INFO_URL = "https://eu.zonerama.com/Part/PhotoOnSlide"
-
-
-def download_photo(photo_id: PhotoId, destination_folder: str = os.getcwd()) -> None:
-    response = requests.get(f"{PHOTO_DOWNLOAD_URL}/{photo_id}")
-    response.raise_for_status()
-
-    if response.headers["content-type"] == "text/html; charset=utf-8":
+DEFAULT_WORKERS = 8
+
+
+def download_photo(
+    photo_id: PhotoId,
+    destination_folder: str = os.getcwd(),
+    session: ZoneramaSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    skip_existing: bool = False,
+) -> str:
+    partial = PartialDownload.load(
+        partial_download_path(destination_folder, f"photo-{photo_id}")
+    )
+    if not resume:
+        partial.reset()
+
+    def check_response(response: requests.Response) -> str:
+        return _parse_photo_filename(photo_id, response.headers)
+
+    return download_resumable(
+        resolve_session(session),
+        f"{PHOTO_DOWNLOAD_URL}/{photo_id}",
+        partial,
+        destination_folder,
+        check_response,
+        chunk_size,
+        skip_existing,
+    )
+
+
+def _parse_photo_filename(photo_id: PhotoId, headers: Mapping[str, str]) -> str:
+    if headers["content-type"] == "text/html; charset=utf-8":
         raise InvalidPhotoIdException(photo_id)
 
-    assert response.headers["content-type"].startswith(("image", "video"))
+    assert headers["content-type"].startswith(("image", "video"))
 
-    content_disposition = response.headers["content-disposition"]
+    content_disposition = headers["content-disposition"]
     mtch = re.match(r'attachment; filename="?([^"]+)"?', content_disposition)
     assert mtch is not None
-    filename = mtch.group(1)
-
-    with open(os.path.join(destination_folder, filename), "wb") as df:
-        df.write(response.content)
+    return mtch.group(1)
+
+
+def download_photos(
+    photo_ids: list[PhotoId],
+    destination_folder: str = os.getcwd(),
+    workers: int = DEFAULT_WORKERS,
+    session: ZoneramaSession | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_existing: bool = True,
+) -> list[str]:
+    """Downloads the photos with the provided IDs concurrently. \
+        At most workers photos are downloaded at once, \
+        all of them sharing the connection pool of the session.
+
+    Args:
+        photo_ids (list[PhotoId]): The IDs of the photos.
+        destination_folder (str, optional): \
+            The destination folder for the photos. Defaults to os.getcwd().
+        workers (int, optional): The maximum number of photos \
+            downloaded at once. Should not exceed the pool size of the session. \
+            Defaults to DEFAULT_WORKERS.
+        session (ZoneramaSession | None, optional): \
+            The session to send the requests with. \
+            Defaults to the module-level session.
+        chunk_size (int, optional): The size of the buffer \
+            used to stream each photo to disk, in bytes. \
+            Defaults to DEFAULT_CHUNK_SIZE.
+        skip_existing (bool, optional): Whether to skip photos \
+            which have already been downloaded completely. Defaults to True.
+
+    Returns:
+        list[str]: The paths of the downloaded photos, in the order of photo_ids.
+    """
+    session = resolve_session(session)
+    # None of the photos can exist in an empty folder, even once the first land
+    skip_existing = skip_existing and has_downloads(destination_folder)
+
+    def download(photo_id: PhotoId) -> str:
+        return download_photo(
+            photo_id,
+            destination_folder,
+            session,
+            chunk_size,
+            skip_existing=skip_existing,
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(download, photo_ids))
 
 
 @dataclass
@@ -52,19 +134,42 @@ class PhotoInfo:
     software: str
 
 
-def get_photo_info(photo_id: PhotoId) -> PhotoInfo:  # WIP
+def get_photo_info(
+    photo_id: PhotoId,
+    session: ZoneramaSession | None = None,
+    parser: Parser = DEFAULT_PARSER,
+) -> PhotoInfo:  # WIP
     pass
 
-    response = requests.get(PHOTO_INFO_URL, params={"ID": photo_id})
+    response = resolve_session(session).get(PHOTO_INFO_URL, params={"ID": photo_id})
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, features="lxml")
-    param = soup.find("div", class_="param")
-    assert isinstance(param, Tag)
-    tbody = param.find("tbody")
-    assert isinstance(tbody, Tag)
-
-    params = [
-        tr.find_all("td")[1].text.strip() for tr in tbody.find_all("tr") if len(tr) >= 2
-    ]
+    return _parse_photo_info(response.text, parser)
+
+
+def _parse_photo_info(html: str, parser: Parser = DEFAULT_PARSER) -> PhotoInfo:
+    if parser == "bs4":
+        soup = BeautifulSoup(html, features="lxml")
+        param = soup.find("div", class_="param")
+        assert isinstance(param, Tag)
+        tbody = param.find("tbody")
+        assert isinstance(tbody, Tag)
+
+        params = [
+            tr.find_all("td")[1].text.strip()
+            for tr in tbody.find_all("tr")
+            if len(tr) >= 2
+        ]
+        return PhotoInfo(*params)
+
+    param = find_class(parse_document(html), "param", "div")
+    assert param is not None
+    tbody = param.find(".//tbody")
+    assert tbody is not None
+
+    params = []
+    for tr in tbody.iterfind(".//tr"):
+        tds = tr.findall(".//td")
+        if len(tds) >= 2:
+            params.append(tds[1].text_content().strip())
     return PhotoInfo(*params)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, replace
+from time import monotonic, sleep
+from typing import Awaitable, Callable, Iterator
+
+DEFAULT_INITIAL_INTERVAL = 1.0  # seconds
+MIN_INITIAL_INTERVAL = 0.25  # seconds
+DEFAULT_MAX_INTERVAL = 15.0  # seconds
+DEFAULT_DEADLINE = 60.0 * 60  # seconds
+# A rough estimate of how fast the server generates ZIP files, in bytes per second
+ZIP_GENERATION_RATE = 50 * 1024**2
+
+
+@dataclass
+class PollingProgress:
+    attempt: int  # the number of the polls made so far
+    elapsed: float  # seconds since the first poll
+    next_interval: float  # seconds until the next poll
+
+
+@dataclass
+class PollingStrategy:
+    """Decides how often to ask the server whether a job is done. \
+        Starts polling fast and backs off exponentially with random jitter \
+        up to max_interval, giving up after deadline seconds.
+    """
+
+    initial: float | None = None  # None to scale it with scaled_to
+    factor: float = 1.5
+    max_interval: float = DEFAULT_MAX_INTERVAL
+    jitter: float = 0.1  # the maximum relative deviation of an interval
+    deadline: float | None = DEFAULT_DEADLINE  # seconds, None to poll forever
+    on_progress: Callable[[PollingProgress], None] | None = None
+
+    @classmethod
+    def fixed(cls, interval: float, **kwargs) -> PollingStrategy:
+        """A strategy polling every interval seconds."""
+        return cls(initial=interval, factor=1.0, jitter=0.0, **kwargs)
+
+    def scaled_to(self, zip_size: int) -> PollingStrategy:
+        """Returns a copy with the initial interval scaled \
+            to the estimated time the server takes to generate a ZIP file \
+            of zip_size bytes. Copies with an initial interval set are unchanged.
+        """
+        if self.initial is not None:
+            return self
+
+        expected = zip_size / ZIP_GENERATION_RATE
+        return replace(
+            self,
+            initial=min(max(expected / 4, MIN_INITIAL_INTERVAL), self.max_interval),
+        )
+
+    def intervals(self) -> Iterator[float]:
+        interval = DEFAULT_INITIAL_INTERVAL if self.initial is None else self.initial
+        while True:
+            yield interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            interval = min(interval * self.factor, self.max_interval)
+
+    def _schedule(self) -> Iterator[float]:
+        """Yields the time to wait before each poll after the first one \
+            and reports progress, until the deadline passes.
+        """
+        start = monotonic()
+        for attempt, interval in enumerate(self.intervals(), start=1):
+            elapsed = monotonic() - start
+            if self.deadline is not None:
+                if elapsed >= self.deadline:
+                    return
+                interval = min(interval, self.deadline - elapsed)
+
+            if self.on_progress is not None:
+                self.on_progress(PollingProgress(attempt, elapsed, interval))
+            yield interval
+
+    def wait(self, is_ready: Callable[[], bool]) -> bool:
+        """Polls is_ready until it returns True.
+
+        Returns:
+            bool: Whether is_ready returned True before the deadline.
+        """
+        if is_ready():
+            return True
+
+        for interval in self._schedule():
+            sleep(interval)
+            if is_ready():
+                return True
+
+        return False
+
+    async def wait_async(self, is_ready: Callable[[], Awaitable[bool]]) -> bool:
+        """An asynchronous version of wait."""
+        if await is_ready():
+            return True
+
+        for interval in self._schedule():
+            await asyncio.sleep(interval)
+            if await is_ready():
+                return True
+
+        return False
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, ContextManager, Iterable, Iterator, Literal
+
+Phase = Literal["metadata", "zip request", "readiness wait", "transfer", "disk write"]
+PHASES: tuple[Phase, ...] = (
+    "metadata",
+    "zip request",
+    "readiness wait",
+    "transfer",
+    "disk write",
+)
+
+
+@dataclass
+class DownloadProfiler:
+    """Adds up the time a download spends in each Phase \
+        and counts the bytes written to disk. \
+        The time of the transfer and disk write phases is summed \
+        over all connections of a segmented download, so it may exceed \
+        the wall time. Thread-safe.
+    """
+
+    phases: dict[Phase, float] = field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
+    bytes_written: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def add(self, phase: Phase, seconds: float, size: int = 0) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+            self.bytes_written += size
+
+    @contextmanager
+    def phase(self, phase: Phase) -> Iterator[None]:
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - began)
+
+    def chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yields chunks, counting the time spent waiting for each one \
+            as transfer and the time until the next one is asked for \
+            as disk write.
+        """
+        iterator = iter(chunks)
+        while True:
+            began = perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.add("transfer", perf_counter() - began)
+                return
+
+            received = perf_counter()
+            self.add("transfer", received - began)
+            try:
+                yield chunk
+            finally:
+                self.add("disk write", perf_counter() - received, len(chunk))
+
+    def report(self) -> dict[str, Any]:
+        """Returns the seconds spent by phase and the throughput \
+            of the transfer and the disk writes in MB/s.
+        """
+        with self._lock:
+            phases = dict(self.phases)
+            size = self.bytes_written
+
+        def throughput(seconds: float) -> float | None:
+            return size / 1024**2 / seconds if seconds > 0 else None
+
+        return {
+            "phases": phases,
+            "bytes": size,
+            "transfer_mb_s": throughput(phases["transfer"]),
+            "disk_write_mb_s": throughput(phases["disk write"]),
+        }
+
+
+def profile_phase(profiler: DownloadProfiler | None, phase: Phase) -> ContextManager:
+    return nullcontext() if profiler is None else profiler.phase(phase)
+
+
+def profile_chunks(
+    profiler: DownloadProfiler | None, chunks: Iterable[bytes]
+) -> Iterable[bytes]:
+    return chunks if profiler is None else profiler.chunks(chunks)
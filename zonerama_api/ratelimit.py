@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep, time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_RATE = 10.0  # requests per second per host
+DEFAULT_BURST = 10  # requests sent at once after a pause
+MIN_RATE = 0.5  # requests per second
+BACKOFF_FACTOR = 0.5  # the rate is multiplied by this on a throttling response
+RECOVERY = 0.05  # the share of the maximum rate regained per other response
+THROTTLING_STATUSES = (429, 503)
+
+
+@dataclass
+class HostStats:
+    rate: float  # the current allowed rate, in requests per second
+    max_rate: float
+    queue_depth: int  # the number of requests waiting for a token
+    blocked_for: float  # seconds until the next request may be sent
+    throttled: int  # the number of throttling responses received
+
+
+@dataclass
+class _Bucket:
+    rate: float
+    max_rate: float
+    burst: float
+    tokens: float
+    updated: float  # tokens are refilled from this monotonic time on
+    waiting: int = 0
+    throttled: int = 0
+
+
+@dataclass
+class RateLimiter:
+    """A token bucket per host, pacing the requests of all the threads \
+        and coroutines sharing it. A 429 or 503 response halves the rate \
+        of its host and pauses it for the time given by Retry-After, \
+        after which the rate recovers gradually with every other response.
+    """
+
+    rate: float = DEFAULT_RATE  # the maximum rate of hosts not in rates
+    burst: int = DEFAULT_BURST
+    rates: dict[str, float] = field(default_factory=dict)  # by host
+    _buckets: dict[str, _Bucket] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.rates.get(host, self.rate)
+            bucket = self._buckets[host] = _Bucket(
+                rate, rate, self.burst, self.burst, monotonic()
+            )
+        return bucket
+
+    def _reserve(self, host: str) -> float:
+        """Takes a token, which may not be there yet, \
+            and returns how many seconds to wait before using it.
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            now = monotonic()
+            bucket.tokens = min(
+                bucket.tokens + max(now - bucket.updated, 0.0) * bucket.rate,
+                bucket.burst,
+            )
+            bucket.updated = max(bucket.updated, now)
+            bucket.tokens -= 1
+
+            delay = bucket.updated - now + max(-bucket.tokens, 0.0) / bucket.rate
+            if delay > 0:
+                bucket.waiting += 1
+            return delay
+
+    def _release(self, host: str) -> None:
+        with self._lock:
+            self._buckets[host].waiting -= 1
+
+    def acquire(self, host: str) -> None:
+        """Blocks until a request to host may be sent."""
+        delay = self._reserve(host)
+        if delay > 0:
+            try:
+                sleep(delay)
+            finally:
+                self._release(host)
+
+    async def acquire_async(self, host: str) -> None:
+        """An asynchronous version of acquire."""
+        delay = self._reserve(host)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._release(host)
+
+    def feedback(self, host: str, status: int, retry_after: str | None) -> None:
+        """Adjusts the rate of host to the status of a response from it."""
+        with self._lock:
+            bucket = self._bucket(host)
+            if status not in THROTTLING_STATUSES:
+                bucket.rate = min(
+                    bucket.rate + bucket.max_rate * RECOVERY, bucket.max_rate
+                )
+                return
+
+            bucket.throttled += 1
+            bucket.rate = max(bucket.rate * BACKOFF_FACTOR, MIN_RATE)
+            pause = parse_retry_after(retry_after)
+            if pause is None:
+                pause = 1 / bucket.rate
+
+            # No tokens accumulate during the pause
+            bucket.tokens = min(bucket.tokens, 0.0)
+            bucket.updated = max(bucket.updated, monotonic() + pause)
+
+    def stats(self) -> dict[str, HostStats]:
+        """Returns the current state of each host requested so far."""
+        with self._lock:
+            now = monotonic()
+            return {
+                host: HostStats(
+                    bucket.rate,
+                    bucket.max_rate,
+                    bucket.waiting,
+                    max(bucket.updated - now, 0.0),
+                    bucket.throttled,
+                )
+                for host, bucket in self._buckets.items()
+            }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header, either seconds or an HTTP date, \
+        into seconds from now. Returns None if missing or invalid.
+    """
+    if value is None:
+        return None
+
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """An HTTPAdapter pacing the requests it sends with a RateLimiter."""
+
+    rate_limiter: RateLimiter | None
+
+    def __init__(
+        self, *args, rate_limiter: RateLimiter | None = None, **kwargs
+    ) -> None:
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        if self.rate_limiter is None:
+            return super().send(request, *args, **kwargs)
+
+        host = urlsplit(request.url).hostname or ""
+        self.rate_limiter.acquire(host)
+        response = super().send(request, *args, **kwargs)
+        self.rate_limiter.feedback(
+            host, response.status_code, response.headers.get("retry-after")
+        )
+        return response
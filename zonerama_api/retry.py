@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+from dataclasses import dataclass, field
+from time import monotonic, sleep
+from typing import Literal, Mapping
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from zonerama_api.exceptions import CircuitOpenException
+from zonerama_api.ratelimit import RateLimitedAdapter, parse_retry_after
+
+EndpointClass = Literal["metadata", "folder", "polling", "download", "action"]
+
+# The first pattern matching the path of a URL decides its class
+ENDPOINT_CLASSES: list[tuple[re.Pattern[str], EndpointClass]] = [
+    (re.compile(r"^/Zip/IsReady/"), "polling"),
+    (re.compile(r"^/Zip/Download/|^/Download/Photo/"), "download"),
+    # Each request starts generating a ZIP file on the server
+    (re.compile(r"^/Zip/Album/"), "action"),
+    (re.compile(r"^/Web/"), "action"),
+    (re.compile(r"^/Part/AlbumsInTab"), "folder"),
+    (re.compile(r"^/"), "metadata"),
+]
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+FAILURE_STATUSES = (500, 502, 503, 504)  # count towards opening the circuit
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long apart a failed request is repeated. \
+        Requests which are not idempotent are only repeated \
+        if they failed to connect, so they never reached the server.
+    """
+
+    retries: int = 3
+    backoff: float = 0.5  # seconds before the first retry
+    factor: float = 2.0
+    max_backoff: float = 30.0  # seconds
+    jitter: float = 0.5  # the maximum relative deviation of a delay
+    idempotent: bool = True
+    statuses: tuple[int, ...] = RETRY_STATUSES
+    # Statuses counting as failures of the host for the circuit breaker
+    failure_statuses: tuple[int, ...] = FAILURE_STATUSES
+
+    def delay(self, retry: int, retry_after: str | None = None) -> float:
+        """The seconds to wait before the retry-th retry, counted from 0."""
+        delay = min(self.backoff * self.factor**retry, self.max_backoff)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = max(delay, min(server_delay, self.max_backoff))
+        return delay
+
+
+DEFAULT_RETRY_POLICIES: Mapping[EndpointClass, RetryPolicy] = {
+    "metadata": RetryPolicy(retries=3),
+    # Answers 500 for deleted folders, which is neither transient nor a failure
+    "folder": RetryPolicy(
+        retries=3, statuses=(429, 502, 503, 504), failure_statuses=(502, 503, 504)
+    ),
+    # Missing a poll is cheap, giving up on a ZIP file generated for minutes is not
+    "polling": RetryPolicy(retries=6, max_backoff=60.0),
+    "download": RetryPolicy(retries=4, backoff=1.0),
+    "action": RetryPolicy(retries=2, idempotent=False),
+}
+
+
+def endpoint_class(url: str) -> EndpointClass | None:
+    path = urlsplit(url).path
+    for pattern, cls in ENDPOINT_CLASSES:
+        if pattern.search(path):
+            return cls
+    return None
+
+
+def is_connect_error(e: requests.RequestException) -> bool:
+    """Whether the request failed before being sent to the server."""
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+
+    reason = e.args[0] if isinstance(e, requests.ConnectionError) and e.args else None
+    return isinstance(reason, MaxRetryError) and isinstance(
+        reason.reason, NewConnectionError
+    )
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    opened: float | None = None  # monotonic time, None if closed
+    trial: bool = False  # whether a request is testing a half-open circuit
+
+
+@dataclass
+class CircuitBreaker:
+    """Stops sending requests to a host after failure_threshold \
+        consecutive failures, raising CircuitOpenException instead \
+        for reset_timeout seconds. Then lets a single request through \
+        and closes again if it succeeds.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0  # seconds
+    _circuits: dict[str, _Circuit] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def before_request(self, host: str) -> None:
+        """Raises CircuitOpenException if a request to host may not be sent."""
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            if circuit.opened is None:
+                return
+
+            retry_in = circuit.opened + self.reset_timeout - monotonic()
+            if retry_in > 0 or circuit.trial:
+                raise CircuitOpenException(host, max(retry_in, 0.0))
+            circuit.trial = True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._circuits[host] = _Circuit()
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.failures += 1
+            if circuit.trial or circuit.failures >= self.failure_threshold:
+                circuit.opened = monotonic()
+                circuit.trial = False
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(host)
+            return circuit is not None and circuit.opened is not None
+
+
+class RetryingAdapter(RateLimitedAdapter):
+    """An HTTPAdapter repeating failed requests by the RetryPolicy \
+        of their endpoint class and guarding each host with a CircuitBreaker. \
+        Every attempt waits for the rate limiter.
+    """
+
+    retry_policies: Mapping[EndpointClass, RetryPolicy]
+    circuit_breaker: CircuitBreaker | None
+
+    def __init__(
+        self,
+        *args,
+        retry_policies: Mapping[EndpointClass, RetryPolicy] = DEFAULT_RETRY_POLICIES,
+        circuit_breaker: CircuitBreaker | None = None,
+        **kwargs,
+    ) -> None:
+        self.retry_policies = retry_policies
+        self.circuit_breaker = circuit_breaker
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        host = urlsplit(request.url).hostname or ""
+        cls = endpoint_class(request.url)
+        policy = None if cls is None else self.retry_policies.get(cls)
+
+        failure_statuses = (
+            FAILURE_STATUSES if policy is None else policy.failure_statuses
+        )
+
+        retry = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(host)
+
+            # Anything but a response which is not a failure counts as one,
+            # so that an unexpected exception still ends a half-open trial
+            success = False
+            try:
+                response = super().send(request, *args, **kwargs)
+                success = response.status_code not in failure_statuses
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if (
+                    policy is None
+                    or retry >= policy.retries
+                    or not (policy.idempotent or is_connect_error(e))
+                ):
+                    raise
+
+                delay = policy.delay(retry)
+            else:
+                if (
+                    policy is None
+                    or retry >= policy.retries
+                    or not policy.idempotent
+                    or response.status_code not in policy.statuses
+                ):
+                    return response
+
+                response.close()
+                delay = policy.delay(retry, response.headers.get("retry-after"))
+            finally:
+                self._record(host, success)
+
+            sleep(delay)
+            retry += 1
+
+    def _record(self, host: str, success: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+
+        if success:
+            self.circuit_breaker.record_success(host)
+        else:
+            self.circuit_breaker.record_failure(host)
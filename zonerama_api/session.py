@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import threading
+from typing import Mapping
+
+import requests
+
+from zonerama_api.cache import CachingAdapter, ResponseCache
+from zonerama_api.metrics import RequestMetrics
+from zonerama_api.ratelimit import RateLimiter
+from zonerama_api.retry import (
+    DEFAULT_RETRY_POLICIES,
+    CircuitBreaker,
+    EndpointClass,
+    RetryingAdapter,
+    RetryPolicy,
+)
+
+DEFAULT_TIMEOUT = (10.0, 60.0)  # (connect, read) in seconds
+DEFAULT_POOL_CONNECTIONS = 4  # zonerama.com, eu.zonerama.com and some spare
+DEFAULT_POOL_MAXSIZE = 16  # keep-alive connections kept per host
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+Timeout = float | tuple[float, float] | None
+
+
+class ZoneramaSession(requests.Session):
+    """A shared HTTP transport for the Zonerama web API. \
+        Keeps a pool of keep-alive connections per host, \
+        so consecutive requests to zonerama.com and eu.zonerama.com \
+        skip the TCP and TLS handshakes. \
+        Applies a default timeout to every request, \
+        which can still be overridden per call. \
+        Retries failed requests by the RetryPolicy of their endpoint class. \
+        Optionally answers the metadata requests from a ResponseCache, \
+        paces the requests with a RateLimiter and fails fast \
+        while Zonerama is down with a CircuitBreaker. \
+        Optionally records RequestMetrics of every request.
+    """
+
+    timeout: Timeout
+    cache: ResponseCache | None
+    rate_limiter: RateLimiter | None
+    circuit_breaker: CircuitBreaker | None
+    metrics: RequestMetrics | None
+
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policies: Mapping[EndpointClass, RetryPolicy] = DEFAULT_RETRY_POLICIES,
+        circuit_breaker: CircuitBreaker | None = None,
+        metrics: RequestMetrics | None = None,
+    ) -> None:
+        """
+        Args:
+            timeout (Timeout, optional): The default (connect, read) timeout \
+                in seconds. Defaults to DEFAULT_TIMEOUT.
+            pool_connections (int, optional): The number of hosts \
+                to keep connection pools for. Defaults to DEFAULT_POOL_CONNECTIONS.
+            pool_maxsize (int, optional): The maximum number of connections \
+                kept alive per host. Should be at least the number of threads \
+                sharing the session. Defaults to DEFAULT_POOL_MAXSIZE.
+            cache (ResponseCache | None, optional): The cache to answer \
+                the metadata requests from. Defaults to None.
+            rate_limiter (RateLimiter | None, optional): The rate limiter \
+                to pace the requests with. Share one between sessions \
+                to share its budgets. Defaults to None.
+            retry_policies (Mapping[EndpointClass, RetryPolicy], optional): \
+                The retry policies by endpoint class. Leave a class out \
+                not to retry its requests. Defaults to DEFAULT_RETRY_POLICIES.
+            circuit_breaker (CircuitBreaker | None, optional): \
+                The circuit breaker guarding the hosts. Defaults to None.
+            metrics (RequestMetrics | None, optional): The metrics to record \
+                the requests in. Defaults to None.
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics
+        self.headers.update(DEFAULT_HEADERS)
+
+        adapter_kwargs = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            rate_limiter=rate_limiter,
+            retry_policies=retry_policies,
+            circuit_breaker=circuit_breaker,
+        )
+        if cache is None:
+            adapter = RetryingAdapter(**adapter_kwargs)
+        else:
+            adapter = CachingAdapter(cache, **adapter_kwargs)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        # Also called for each redirect
+        if self.metrics is None:
+            return super().send(request, **kwargs)
+
+        start = self.metrics.start(request.method, request.url)
+        body = request.body or b""
+        try:
+            response = super().send(request, **kwargs)
+        except Exception as e:
+            self.metrics.end(start, None, len(body), error=e)
+            raise
+
+        if getattr(response, "from_cache", False):
+            self.metrics.end(start, response.status_code, from_cache=True)
+            return response
+
+        if kwargs.get("stream"):
+            bytes_in = int(response.headers.get("content-length", 0))
+        else:
+            bytes_in = len(response.content)
+        self.metrics.end(start, response.status_code, len(body), bytes_in)
+        return response
+
+
+_default_session: ZoneramaSession | None = None
+_default_session_lock = threading.Lock()
+
+
+def get_default_session() -> ZoneramaSession:
+    """Returns the module-level session used when no session is passed, \
+        creating it on first use. It has a circuit breaker, \
+        so threads sharing it stop waiting on timeouts while Zonerama is down.
+    """
+    global _default_session
+
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = ZoneramaSession(circuit_breaker=CircuitBreaker())
+        return _default_session
+
+
+def set_default_session(session: ZoneramaSession | None) -> None:
+    """Replaces the module-level session used when no session is passed. \
+        Passing None makes a fresh one be created on next use.
+    """
+    global _default_session
+
+    with _default_session_lock:
+        _default_session = session
+
+
+def resolve_session(session: ZoneramaSession | None) -> ZoneramaSession:
+    return get_default_session() if session is None else session